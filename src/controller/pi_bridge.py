@@ -11,6 +11,21 @@ from pathlib import Path
 
 from PySide6.QtCore import QObject, Signal
 
+try:
+    import orjson as _orjson
+except ImportError:  # optional speed-up — stdlib json is the fallback
+    _orjson = None
+
+# Buffer size for pi's stdin/stdout pipes.  ``get_messages`` returns the
+# whole session — inline base64 attachments included — as one JSONL line,
+# which the default 8 KiB buffer reads back in thousands of small chunks.
+# Commands are flushed explicitly in ``_send``, so the larger write buffer
+# never holds them back.
+_PIPE_BUFFER_SIZE = 1 << 20
+
+# Characters of a rejected stdout line echoed to stderr.
+_LOG_PREVIEW_CHARS = 200
+
 
 class PiRPCBridge(QObject):
     """Spawns `pi --mode rpc` as a subprocess and emits Qt signals from the RPC event stream.
@@ -58,7 +73,7 @@ class PiRPCBridge(QObject):
     compact_end = Signal(str, object)    # reason, result dict or None
 
     # ── session entries ─────────────────────────────────────────────────
-    entry_appended = Signal(str, object)   # entry_type, entry dict
+    entry_appended = Signal(str, object)   # entry_type, entry dict (custom only)
 
     # ── extension UI ────────────────────────────────────────────────────
     extension_ui_dialog = Signal(str, str, str, object)  # request_id, method,
@@ -74,6 +89,8 @@ class PiRPCBridge(QObject):
         self._process: subprocess.Popen[str] | None = None
         self._reader: threading.Thread | None = None
         self._running: bool = False
+        # Unknown event types already reported; see _warn_unrecognised().
+        self._unrecognised: set[tuple[str, str]] = set()
 
     # ── public API ──────────────────────────────────────────────────────
 
@@ -102,6 +119,7 @@ class PiRPCBridge(QObject):
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             text=True,
+            bufsize=_PIPE_BUFFER_SIZE,
         )
         self._running = True
         self._reader = threading.Thread(target=self._read_loop, daemon=True)
@@ -123,6 +141,10 @@ class PiRPCBridge(QObject):
         """Send an arbitrary RPC command (e.g. set_model, new_session)."""
         self._send(cmd)
 
+    def send_commands(self, cmds: list[dict]) -> None:
+        """Send several RPC commands with a single write and flush."""
+        self._write("".join(_dumps_line(cmd) for cmd in cmds))
+
     def send_extension_ui_response(
         self, request_id: str, response: dict
     ) -> None:
@@ -172,6 +194,7 @@ class PiRPCBridge(QObject):
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             text=True,
+            bufsize=_PIPE_BUFFER_SIZE,
             cwd=cwd,
         )
         self._running = True
@@ -197,12 +220,16 @@ class PiRPCBridge(QObject):
     # ── internal helpers ────────────────────────────────────────────────
 
     def _send(self, cmd: dict) -> None:
+        self._write(_dumps_line(cmd))
+
+    def _write(self, data: str) -> None:
         proc = self._process
         if proc is None or proc.stdin is None:
             print("[pi_bridge] send: no process", file=sys.stderr)
             return
-        line = json.dumps(cmd, ensure_ascii=False, separators=(",", ":")) + "\n"
-        proc.stdin.write(line)
+        if not data:
+            return
+        proc.stdin.write(data)
         proc.stdin.flush()
 
     def _read_loop(self) -> None:
@@ -220,11 +247,22 @@ class PiRPCBridge(QObject):
                 if not line:
                     continue
                 try:
-                    event = json.loads(line)
+                    event = _loads(line)
                 except json.JSONDecodeError:
-                    print(f"[pi_bridge] bad JSON: {line!r}", file=sys.stderr)
+                    print(f"[pi_bridge] bad JSON: {_log_preview(line)}", file=sys.stderr)
                     continue
-                self._route_event(event)
+                if not isinstance(event, dict):
+                    print(f"[pi_bridge] non-object event: {_log_preview(line)}", file=sys.stderr)
+                    continue
+                # A malformed event must not take the reader thread down
+                # with it — every later event would be lost silently.
+                try:
+                    self._route_event(event)
+                except Exception as exc:
+                    print(
+                        f"[pi_bridge] failed to route {event.get('type')!r} event: {exc!r}",
+                        file=sys.stderr,
+                    )
         except (OSError, ValueError) as exc:
             if self._running:
                 self.error.emit(f"pi stdout read error: {exc}")
@@ -240,6 +278,12 @@ class PiRPCBridge(QObject):
     def _route_event(self, event: dict) -> None:
         et = event.get("type", "")
 
+        # ── message updates (streaming text + thinking) ───────
+        # One event per streamed token — test it before anything else.
+        if et == "message_update":
+            self._route_message_update(event)
+            return
+
         # ── bracketing ─────────────────────────────────────────
         if et == "agent_start":
             self.busy_changed.emit(True)
@@ -261,10 +305,6 @@ class PiRPCBridge(QObject):
             # assistant_stream_end.  Nothing to do here.
             return
 
-        # ── message updates (streaming text + thinking) ───────
-        if et == "message_update":
-            self._route_message_update(event)
-            return
         if et == "message_end":
             self.assistant_stream_end.emit()
             return
@@ -331,10 +371,11 @@ class PiRPCBridge(QObject):
         # ── session entry appended ───────────────────────────
         if et == "entry_appended":
             entry = event.get("entry", {})
-            if isinstance(entry, dict):
-                self.entry_appended.emit(
-                    str(entry.get("type", "")), entry
-                )
+            # Only custom entries have no streaming-event counterpart;
+            # message entries repeat what the stream already delivered, so
+            # don't queue their (full-content) payloads to the UI thread.
+            if isinstance(entry, dict) and entry.get("type") == "custom":
+                self.entry_appended.emit("custom", entry)
             return
 
         # ── agent settled (after extension cleanup) ──────────
@@ -355,10 +396,7 @@ class PiRPCBridge(QObject):
             return
 
         # ── unrecognised ──────────────────────────────────────
-        print(
-            f"[pi_bridge] unrecognised event type: {et}",
-            file=sys.stderr,
-        )
+        self._warn_unrecognised("event type", et)
 
     def _route_message_update(self, event: dict) -> None:
         ame = event.get("assistantMessageEvent")
@@ -392,10 +430,19 @@ class PiRPCBridge(QObject):
         elif at == "error":
             self.error.emit(ame.get("reason", "stream error"))
         else:
-            print(
-                f"[pi_bridge] unrecognised message update type: {at}",
-                file=sys.stderr,
-            )
+            self._warn_unrecognised("message update type", at)
+
+    def _warn_unrecognised(self, kind: str, name: object) -> None:
+        """Report an unknown event type once, not on every occurrence.
+
+        Unknown ``message_update`` types can arrive once per streamed token,
+        so repeating the warning would flood stderr during a response.
+        """
+        key = (kind, str(name))
+        if key in self._unrecognised:
+            return
+        self._unrecognised.add(key)
+        print(f"[pi_bridge] unrecognised {kind}: {name}", file=sys.stderr)
 
 
     # ── extension UI routing ───────────────────────────────────
@@ -584,16 +631,67 @@ class PiRPCBridge(QObject):
 
 # ── helpers ──────────────────────────────────────────────────────────
 
+def _loads(line: str) -> object:
+    """Parse one line of pi's JSONL stream, using orjson when installed.
+
+    orjson is several times faster on large ``get_messages`` payloads but
+    stricter than the stdlib (e.g. it rejects lone surrogate escapes that
+    ``JSON.stringify`` can emit), so anything it refuses is retried with
+    :func:`json.loads`.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.loads(line)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(line)
+
+
+def _log_preview(line: str) -> str:
+    """repr() of the start of *line* — enough to identify a bad line.
+
+    A rejected line can be a multi-megabyte payload, and a misbehaving
+    extension may print many of them; repr-ing each in full is costly
+    and floods the terminal.
+    """
+    if len(line) <= _LOG_PREVIEW_CHARS:
+        return repr(line)
+    return f"{line[:_LOG_PREVIEW_CHARS]!r}... ({len(line)} chars)"
+
+
+def _dumps_line(cmd: dict) -> str:
+    """Serialise one RPC command as a JSONL line, using orjson when installed.
+
+    ``prompt`` commands carry base64 image attachments, where orjson is
+    several times faster.  Its output matches the compact, non-ASCII
+    preserving stdlib form.  Anything it refuses (lone surrogates from a
+    paste, non-string keys) falls back to :func:`json.dumps` with
+    ``ensure_ascii`` so surrogates go out as ``\\uXXXX`` escapes — pi's
+    stdin is UTF-8 and cannot encode them raw.
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(cmd, option=_orjson.OPT_APPEND_NEWLINE).decode()
+        except TypeError:  # orjson.JSONEncodeError subclasses TypeError
+            return json.dumps(cmd, separators=(",", ":")) + "\n"
+    return json.dumps(cmd, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _join_text_blocks(blocks: list) -> str:
+    """Concatenate the ``text`` of every ``{type: "text"}`` block in *blocks*."""
+    return "".join([
+        str(block.get("text", ""))
+        for block in blocks
+        if isinstance(block, dict) and block.get("type") == "text"
+    ])
+
+
 def _extract_text_from_content(result: dict) -> str:
     """Extract concatenated text from an OpenAI-style content array."""
     content = result.get("content", [])
     if not isinstance(content, list):
         return ""
-    parts: list[str] = []
-    for block in content:
-        if isinstance(block, dict) and block.get("type") == "text":
-            parts.append(str(block.get("text", "")))
-    return "".join(parts)
+    return _join_text_blocks(content)
 
 
 def _str_content(content: object) -> str:
@@ -605,9 +703,5 @@ def _str_content(content: object) -> str:
     if isinstance(content, str):
         return content
     if isinstance(content, list):
-        parts: list[str] = []
-        for block in content:
-            if isinstance(block, dict) and block.get("type") == "text":
-                parts.append(str(block.get("text", "")))
-        return "".join(parts)
+        return _join_text_blocks(content)
     return str(content)
@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import os
 import shutil
+import threading
 from pathlib import Path
 from typing import Protocol
 
@@ -71,6 +72,13 @@ class SttBackend:
         """
         ...
 
+    def preload_model(self, model: str) -> None:
+        """Load *model* into memory ahead of the first ``transcribe()``.
+
+        Optional warm-up hook; may block, so call it on a background
+        thread.  Backends with nothing to preload inherit this no-op.
+        """
+
     def transcribe(self, audio_path: str, model: str = "base",
                    task: str = "transcribe",
                    language: str | None = None) -> str:
@@ -159,6 +167,7 @@ class FasterWhisperBackend(SttBackend):
     _INSTANCE: "FasterWhisperBackend | None" = None  # singleton
     _MODEL_INSTANCE: object | None = None             # cached WhisperModel
     _CURRENT_MODEL: str | None = None                 # which model is loaded
+    _MODEL_LOCK = threading.Lock()                    # preload vs. transcribe
 
     def __init__(self) -> None:
         try:
@@ -244,6 +253,9 @@ class FasterWhisperBackend(SttBackend):
 
         return "".join(text_parts).strip()
 
+    def preload_model(self, model: str) -> None:
+        self._get_or_create_model(model)
+
     # ── internals ──────────────────────────────────────────────────
 
     def _get_or_create_model(self, model_name: str) -> object:
@@ -251,32 +263,34 @@ class FasterWhisperBackend(SttBackend):
 
         If *model_name* differs from the currently cached model,
         the old instance is discarded and a new one is created.
+        Serialised so a preload and a transcription never both load it.
         """
         cls = self.__class__
 
-        # Model change → discard old.
-        if cls._CURRENT_MODEL is not None and cls._CURRENT_MODEL != model_name:
-            cls._MODEL_INSTANCE = None
-            cls._CURRENT_MODEL = None
-
-        if cls._MODEL_INSTANCE is None:
-            if not self.is_model_downloaded(model_name):
-                raise ModelNotDownloaded(
-                    f"Model '{model_name}' is not downloaded. "
-                    "Call download_model() first."
+        with cls._MODEL_LOCK:
+            # Model change → discard old.
+            if cls._CURRENT_MODEL is not None and cls._CURRENT_MODEL != model_name:
+                cls._MODEL_INSTANCE = None
+                cls._CURRENT_MODEL = None
+
+            if cls._MODEL_INSTANCE is None:
+                if not self.is_model_downloaded(model_name):
+                    raise ModelNotDownloaded(
+                        f"Model '{model_name}' is not downloaded. "
+                        "Call download_model() first."
+                    )
+                # Loading the model is slow (several seconds for "base").
+                # We use device="cpu" and compute_type="int8" for broad
+                # compatibility. Users with GPU support can configure
+                # a different compute_type via settings later.
+                cls._MODEL_INSTANCE = self._fw.WhisperModel(
+                    model_name,
+                    device="cpu",
+                    compute_type="int8",
                 )
-            # Loading the model is slow (several seconds for "base").
-            # We use device="cpu" and compute_type="int8" for broad
-            # compatibility. Users with GPU support can configure
-            # a different compute_type via settings later.
-            cls._MODEL_INSTANCE = self._fw.WhisperModel(
-                model_name,
-                device="cpu",
-                compute_type="int8",
-            )
-            cls._CURRENT_MODEL = model_name
-
-        return cls._MODEL_INSTANCE
+                cls._CURRENT_MODEL = model_name
+
+            return cls._MODEL_INSTANCE
 
     def _model_dir(self, model_name: str) -> Path:
         """Return the HuggingFace cache directory for *model_name*.
@@ -28,9 +28,11 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from html import escape
 from pathlib import Path
 from typing import Any
+from urllib.parse import quote as _url_quote, unquote as _url_unquote
 
 from PySide6.QtCore import QEvent, QSettings, Qt, QTimer, QUrl, Signal
 from PySide6.QtGui import QDesktopServices, QGuiApplication
@@ -61,13 +63,28 @@ _md = (
 #  Module-level helpers (pure functions, no Qt)
 # ═══════════════════════════════════════════════════════════════════
 
+# Patterns used on every formatted turn — compiled once at import.
+_CODE_FENCE_RE = re.compile(r"```(.*?)```", re.DOTALL)
+_FENCED_BLOCK_RE = re.compile(r"^```(\w+)?\n(.*)\n```$", re.DOTALL)
+_INLINE_CODE_RE = re.compile(r"`(?:[^`]|\\`)*?`")
+_FILE_REF_RE = re.compile(r"\[file: ([^\]]+)\]")
+_HTML_MEDIA_TAG_RE = re.compile(r'<(img|audio)([^>]*)>', re.IGNORECASE)
+_SRC_ATTR_RE = re.compile(r'\bsrc="([^"]+)"')
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_NON_SPACE_RE = re.compile(r"\S")
+# Placeholder for a code span shielded from file-reference expansion.
+_PROTECTED_KEY_FMT = "\x00FILEREF_SKIP_{}\x00"
+_PROTECTED_KEY_RE = re.compile(r"\x00FILEREF_SKIP_(\d+)\x00")
+
+_IMG_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg")
+_AUDIO_EXTS = (".wav", ".mp3", ".ogg", ".flac", ".m4a", ".webm")
+
 
 def _split_out_code_fences(markdown: str) -> list[str]:
     """Split markdown into segments, preserving fenced code blocks."""
     parts: list[str] = []
-    fence = re.compile(r"```(.*?)```", re.DOTALL)
     last = 0
-    for m in fence.finditer(markdown):
+    for m in _CODE_FENCE_RE.finditer(markdown):
         if m.start() > last:
             parts.append(markdown[last : m.start()])
         parts.append(markdown[m.start() : m.end()])
@@ -91,22 +108,19 @@ def _render_file_references(content: str) -> str:
     (```...```) is preserved as-is so that quoted or backtick-escaped
     references are never accidentally expanded.
     """
-    from urllib.parse import quote as _url_quote, unquote as _url_unquote
-    _NONCE = "\x00FILEREF_SKIP_"
-    protected: dict[str, str] = {}
+    # Both expansions below need one of these; most messages have neither.
+    if "[file: " not in content and "<" not in content:
+        return content
+
+    protected: list[str] = []
 
     def _protect(m: re.Match) -> str:
-        key = f"{_NONCE}{len(protected)}\x00"
-        protected[key] = m.group(0)
+        key = _PROTECTED_KEY_FMT.format(len(protected))
+        protected.append(m.group(0))
         return key
 
-    content = re.sub(r"(?s)```.*?```", _protect, content)
-    content = re.sub(r"`(?:[^`]|\\`)*?`", _protect, content)
-
-    pattern = re.compile(r"\[file: ([^\]]+)\]")
-
-    _IMG_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp", ".bmp", ".svg")
-    _AUDIO_EXTS = (".wav", ".mp3", ".ogg", ".flac", ".m4a", ".webm")
+    content = _CODE_FENCE_RE.sub(_protect, content)
+    content = _INLINE_CODE_RE.sub(_protect, content)
 
     def _replace(match: re.Match) -> str:
         path = match.group(1)
@@ -124,13 +138,13 @@ def _render_file_references(content: str) -> str:
 
         return match.group(0)
 
-    content = pattern.sub(_replace, content)
+    content = _FILE_REF_RE.sub(_replace, content)
 
     # Handle HTML <img> and <audio> tags — URL-encode local file paths
     def _replace_html_tag(match: re.Match) -> str:
         tag = match.group(1)
         attrs = match.group(2) or ""
-        src_m = re.search(r'\bsrc="([^"]+)"', attrs)
+        src_m = _SRC_ATTR_RE.search(attrs)
         if not src_m:
             return match.group(0)
         path = src_m.group(1)
@@ -150,11 +164,14 @@ def _render_file_references(content: str) -> str:
 
         return match.group(0)
 
-    html_tag_re = re.compile(r'<(img|audio)([^>]*)>', re.IGNORECASE)
-    content = html_tag_re.sub(_replace_html_tag, content)
+    content = _HTML_MEDIA_TAG_RE.sub(_replace_html_tag, content)
+
+    def _restore(m: re.Match) -> str:
+        n = int(m.group(1))
+        return protected[n] if n < len(protected) else m.group(0)
 
-    for key, original in protected.items():
-        content = content.replace(key, original)
+    if protected:
+        content = _PROTECTED_KEY_RE.sub(_restore, content)
 
     return content
 
@@ -169,11 +186,10 @@ def format_content_to_html(content: str) -> str:
 
     segments = _split_out_code_fences(content)
     out: list[str] = []
-    fence_re = re.compile(r"^```(\w+)?\n(.*)\n```$", re.DOTALL)
 
     for seg in segments:
         seg = seg or ""
-        m = fence_re.match(seg.strip())
+        m = _FENCED_BLOCK_RE.match(seg.strip())
         if m:
             lang = (m.group(1) or "").strip().lower()
             code = m.group(2) or ""
@@ -189,88 +205,45 @@ def format_content_to_html(content: str) -> str:
     return "".join(out)
 
 
-def _format_json_block(value: Any) -> str:
-    """Format a Python value for display in a ``<pre>``."""
-    try:
-        if isinstance(value, str):
-            return escape(value)
-        formatted = json.dumps(value, ensure_ascii=False, indent=2)
-        formatted = formatted.replace("\\n", "\n").replace("\\t", "\t")
-        return escape(formatted)
-    except Exception:
-        return escape(str(value))
-
-
-def _fmt_tokens(count: int) -> str:
-    """Format a token count with k / M suffix."""
-    if count >= 1_000_000:
-        return f"{count / 1_000_000:.1f}M"
-    if count >= 1_000:
-        return f"{count // 1_000}k"
-    return str(count)
-
-
-def _format_subagent_details(details: dict) -> str:
-    """Format subagent result details into compact HTML."""
-    results = details.get("results", [])
-    if not isinstance(results, list) or len(results) == 0:
-        return ""
-    r = results[0]
-    if not isinstance(r, dict):
-        return ""
+@lru_cache(maxsize=256)
+def _format_content_cached(content: str) -> str:
+    """Memoised :func:`format_content_to_html` for the render loop.
 
-    parts: list[str] = []
-    agent = str(r.get("agent") or "")
-    if agent:
-        parts.append(f"&#x1f916; {escape(agent)}")
-    model = str(r.get("model") or "")
-    if model:
-        parts.append(escape(model.split("/")[-1] if "/" in model else model))
-    turns = r.get("turns")
-    if isinstance(turns, (int, float)) and turns > 0:
-        parts.append(f"{int(turns)} turn{'s' if int(turns) != 1 else ''}")
-    usage = r.get("usage")
-    if isinstance(usage, dict):
-        inp = int(usage.get("input", 0) or 0)
-        out = int(usage.get("output", 0) or 0)
-        cr = int(usage.get("cacheRead", 0) or 0)
-        if inp + out + cr > 0:
-            usage_parts: list[str] = []
-            if inp:
-                usage_parts.append(f"↑{_fmt_tokens(inp)}")
-            if out:
-                usage_parts.append(f"↓{_fmt_tokens(out)}")
-            if cr:
-                usage_parts.append(f"R{_fmt_tokens(cr)}")
-            parts.append(" ".join(usage_parts))
-    return " &middot; ".join(parts)
+    Every render rebuilds the visible pages from ``_messages``, so the
+    same turns are formatted over and over.  Finished turns never change,
+    so their HTML is looked up here instead of re-running the markdown
+    parser on each render.
+    """
+    return format_content_to_html(content)
+
+
+# Argument shown as the preview for each known tool, by tool name.
+_SUMMARY_FIELDS: dict[str, str] = {
+    "bash": "command",
+    "read": "path",
+    "write": "path",
+    "grep": "pattern",
+    "find": "path",
+    "ls": "path",
+    "subagent": "task",
+    "mempalace_search": "query",
+    "mempalace_remember": "summary",
+    "mempalace_diary_read": "agent_name",
+    "mempalace_diary_write": "agent_name",
+    "mempalace_open_loops": "query",
+    "mempalace_get_drawer": "drawer_id",
+    "mempalace_list_drawers": "wing",
+    "mempalace_mine_project": "path",
+    "mempalace_wake_up": "wing",
+    "fetch_url": "url",
+    "recall": "id",
+    "intercom": "action",
+}
 
 
 def _summary_from_args(tool_name: str, args: dict[str, Any]) -> str:
     """Extract a human-readable preview from structured tool arguments."""
-    primary_field: dict[str, str] = {
-        "bash": "command",
-        "read": "path",
-        "write": "path",
-        "grep": "pattern",
-        "find": "path",
-        "ls": "path",
-        "subagent": "task",
-        "mempalace_search": "query",
-        "mempalace_remember": "summary",
-        "mempalace_diary_read": "agent_name",
-        "mempalace_diary_write": "agent_name",
-        "mempalace_open_loops": "query",
-        "mempalace_get_drawer": "drawer_id",
-        "mempalace_list_drawers": "wing",
-        "mempalace_mine_project": "path",
-        "mempalace_wake_up": "wing",
-        "fetch_url": "url",
-        "recall": "id",
-        "intercom": "action",
-    }
-
-    field = primary_field.get(tool_name)
+    field = _SUMMARY_FIELDS.get(tool_name)
     if field:
         val = args.get(field)
         if isinstance(val, str) and val.strip():
@@ -286,22 +259,31 @@ def _summary_from_args(tool_name: str, args: dict[str, Any]) -> str:
 
     # Generic: first string value.
     for v in args.values():
-        if isinstance(v, str) and v.strip():
-            return v.strip()[:180]
+        if isinstance(v, str):
+            head = _stripped_prefix(v, 180)
+            if head:
+                return head
+            continue
         if isinstance(v, (int, float)):
             return str(v)[:180]
 
     return ""
 
 
-def _decode_html_entities(text: str) -> str:
-    """Decode common HTML entities back to plain text."""
-    return (
-        text.replace("&quot;", '"')
-        .replace("&lt;", "<")
-        .replace("&gt;", ">")
-        .replace("&amp;", "&")
-    )
+def _stripped_prefix(text: str, limit: int) -> str:
+    """Return ``text.strip()[:limit]`` without copying the whole of *text*.
+
+    Tool arguments can hold entire file bodies; only the preview window
+    is sliced out, and the tail is only scanned for non-whitespace.
+    """
+    first = _NON_SPACE_RE.search(text)
+    if first is None:
+        return ""
+    start = first.start()
+    head = text[start:start + limit]
+    if _NON_SPACE_RE.search(text, start + limit) is None:
+        head = head.rstrip()
+    return head
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -627,6 +609,14 @@ document.addEventListener("DOMContentLoaded", function() {
 });
 """
 
+# Constant head of the per-delta streaming call — built once so each
+# delta only serialises its own text.
+_STREAM_DELTA_JS_PREFIX = (
+    "window.thalamusAppendAssistantDelta("
+    + json.dumps("assistant-stream-content")
+    + ","
+)
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  HTML template
@@ -658,6 +648,28 @@ HTML_TEMPLATE = f"""<!DOCTYPE html>
 """
 
 
+# Placeholders filled by _build_html_document.
+_TEMPLATE_SLOT_RE = re.compile(
+    r"/\* (THEME_VARS|PAGE_NAV_CSS) \*/|\{(messages_html|scroll)\}"
+)
+
+
+def _split_template(template: str) -> list[str]:
+    """Split *template* into literal text at even and slot names at odd indices."""
+    parts: list[str] = []
+    pos = 0
+    for m in _TEMPLATE_SLOT_RE.finditer(template):
+        parts.append(template[pos:m.start()])
+        parts.append(m.group(1) or m.group(2))
+        pos = m.end()
+    parts.append(template[pos:])
+    return parts
+
+
+# HTML_TEMPLATE is fixed, so it is scanned for placeholders once here.
+_TEMPLATE_PARTS = _split_template(HTML_TEMPLATE)
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  Page navigation HTML builder
 # ═══════════════════════════════════════════════════════════════════
@@ -767,25 +779,25 @@ def _extract_result_text(item: dict[str, Any]) -> str:
         else:
             return str(result)
 
-    # Fallback: _fmt_result (HTML-escaped, needs decoding).
-    fmt_result = item.get("_fmt_result")
-    if isinstance(fmt_result, str) and fmt_result.strip():
-        plain = _decode_html_entities(fmt_result)
-        plain = re.sub(r"<[^>]+>", "", plain).strip()
-        if plain:
-            return plain
-
-    # Fallback: _fmt_stream (HTML-escaped, needs decoding).
-    fmt_stream = item.get("_fmt_stream")
-    if isinstance(fmt_stream, str) and fmt_stream.strip():
-        plain = _decode_html_entities(fmt_stream)
-        plain = re.sub(r"<[^>]+>", "", plain).strip()
+    # Fallback: partial output streamed by a still-running tool.
+    partial = item.get("_partial_text")
+    if isinstance(partial, str) and partial.strip():
+        plain = _HTML_TAG_RE.sub("", partial).strip()
         if plain:
             return plain
 
     return ""
 
 
+# Built-in tools whose agent-work header is "<label>: <args[field]>".
+_TOOL_HEADER_FIELDS: dict[str, tuple[str, str]] = {
+    "bash": ("Bash", "command"),
+    "read": ("Read", "path"),
+    "edit": ("Edit", "path"),
+    "write": ("Write", "path"),
+}
+
+
 def _render_raw_activity_bubble(
     msgs: list[dict[str, Any]],
     *,  # keyword-only arg
@@ -843,26 +855,12 @@ def _render_raw_activity_bubble(
                 if isinstance(args, dict):
                     agent_name = str(args.get("agent") or args.get("task") or "")
                 header = f"Subagent: {agent_name}" if agent_name else "Subagent"
-            elif tn == "bash":
-                cmd = ""
-                if isinstance(args, dict):
-                    cmd = str(args.get("command") or "")
-                header = f"Bash: {cmd}" if cmd else "Bash"
-            elif tn == "read":
-                path = ""
-                if isinstance(args, dict):
-                    path = str(args.get("path") or "")
-                header = f"Read: {path}" if path else "Read"
-            elif tn == "edit":
-                path = ""
+            elif tn in _TOOL_HEADER_FIELDS:
+                label, field = _TOOL_HEADER_FIELDS[tn]
+                value = ""
                 if isinstance(args, dict):
-                    path = str(args.get("path") or "")
-                header = f"Edit: {path}" if path else "Edit"
-            elif tn == "write":
-                path = ""
-                if isinstance(args, dict):
-                    path = str(args.get("path") or "")
-                header = f"Write: {path}" if path else "Write"
+                    value = str(args.get(field) or "")
+                header = f"{label}: {value}" if value else label
             else:
                 summary = _summary_from_args(tn, args) if isinstance(args, dict) else ""
                 header = f"{display_name}: {summary}" if summary else display_name
@@ -943,7 +941,7 @@ def _render_raw_activity_bubble(
                                                     running_progress.append(f"  \u2192 {tc_name} {tc_args}")
 
             # Nested tool cards for subagent (post-completion).
-            nested_html = ""
+            nested_parts: list[str] = []
             if tn == "subagent":
                 details = item.get("details")
                 if isinstance(details, dict):
@@ -961,11 +959,11 @@ def _render_raw_activity_bubble(
                             tc_css = "aw-tool aw-tool-nested"
                             if tc_collapsed:
                                 tc_css += " aw-tool-collapsed"
-                            nested_html += f'<div class="{tc_css}">'
-                            nested_html += f'  <div class="aw-tool-header" onclick="_toggleAwTool(this)">{tc_text}</div>'
+                            nested_parts.append(f'<div class="{tc_css}">')
+                            nested_parts.append(f'  <div class="aw-tool-header" onclick="_toggleAwTool(this)">{tc_text}</div>')
                             if tc_expanded and tc_expanded != tc_text:
-                                nested_html += f'  <div class="aw-tool-body">{tc_expanded}</div>'
-                            nested_html += "</div>"
+                                nested_parts.append(f'  <div class="aw-tool-body">{tc_expanded}</div>')
+                            nested_parts.append("</div>")
 
             body_text = "\n".join(body_lines)
 
@@ -977,18 +975,22 @@ def _render_raw_activity_bubble(
             if tool_collapsed:
                 css_class += " aw-tool-collapsed"
 
-            html = f'<div class="{css_class}">'
-            html += f'  <div class="aw-tool-header" onclick="_toggleAwTool(this)">{escape(header)}</div>'
-            parts: list[str] = []
+            # One join per tool card: subagent cards can carry many nested
+            # calls and large result bodies, so nothing is built with +=.
+            parts: list[str] = [
+                f'<div class="{css_class}">',
+                f'  <div class="aw-tool-header" onclick="_toggleAwTool(this)">{escape(header)}</div>',
+            ]
             if running_progress:
                 parts.append(f'<div class="aw-tool-body">{"<br>".join(running_progress)}</div>')
             if body_text:
                 parts.append(f'<div class="aw-tool-body">{escape(body_text)}</div>')
-            if nested_html:
-                parts.append(f'<div class="aw-tool-body">{nested_html}</div>')
-            html += "".join(parts)
-            html += "</div>"
-            html_parts.append(html)
+            if nested_parts:
+                parts.append('<div class="aw-tool-body">')
+                parts.extend(nested_parts)
+                parts.append("</div>")
+            parts.append("</div>")
+            html_parts.append("".join(parts))
 
     def _add_activity(msg):
         nonlocal _item_count
@@ -1059,31 +1061,36 @@ def messages_to_html(
 
     end = min(page_end, len(messages))
 
-    # Pre-count total agent-work bubbles and thinking blocks.
+    # One walk over the page: consecutive non-turn messages are grouped
+    # into agent-work runs (rendered as one bubble each), and the totals
+    # the collapse thresholds need are counted on the way.
+    segments: list[list[dict[str, Any]] | tuple[int, dict[str, Any]]] = []
+    run: list[dict[str, Any]] | None = None
     total_aw = 0
     total_thinking = 0
     total_tools = 0
-    _buf: list = []
     for i in range(page_start, end):
-        k = str(messages[i].get("kind", "turn") or "turn")
-        if k == "thinking" and not show_thinking:
+        msg = messages[i]
+        kind = str(msg.get("kind", "turn") or "turn")
+        if kind == "thinking" and not show_thinking:
             continue
-        if k == "tool_stack" and not show_tools:
+        if kind == "tool_stack" and not show_tools:
             continue
-        if k in _NON_TURN_KINDS or k == "activity":
-            _buf.append(messages[i])
-            if k == "thinking":
+        if kind in _NON_TURN_KINDS or kind == "activity":
+            if run is None:
+                run = []
+                segments.append(run)
+                total_aw += 1
+            run.append(msg)
+            if kind == "thinking":
                 total_thinking += 1
-            elif k == "tool_stack":
-                for _item in (messages[i].get("items") or []):
+            elif kind == "tool_stack":
+                for _item in (msg.get("items") or []):
                     if isinstance(_item, dict):
                         total_tools += 1
         else:
-            if _buf:
-                total_aw += 1
-                _buf = []
-    if _buf:
-        total_aw += 1
+            run = None
+            segments.append((i, msg))
 
     collapse_threshold = total_aw if auto_collapse_count <= 0 else max(0, total_aw - auto_collapse_count)
     thinking_threshold = total_thinking if auto_collapse_thinking <= 0 else max(0, total_thinking - auto_collapse_thinking)
@@ -1091,27 +1098,13 @@ def messages_to_html(
     _thinking_idx: list[int] = [0]
     _tools_idx: list[int] = [0]
 
-    # Single-pass rendering (original logic) with collapse check.
     parts: list[str] = []
-    raw_buffer: list[dict[str, Any]] = []
     agent_work_index: int = 0
 
-    for i in range(page_start, end):
-        msg = messages[i]
-        kind = str(msg.get("kind", "turn") or "turn")
-
-        if kind == "thinking" and not show_thinking:
-            continue
-        if kind == "tool_stack" and not show_tools:
-            continue
-        if kind in _NON_TURN_KINDS or kind == "activity":
-            raw_buffer.append(msg)
-            continue
-
-        # Flush raw buffer before every turn.
-        if raw_buffer:
+    for seg in segments:
+        if isinstance(seg, list):
             bubble = _render_raw_activity_bubble(
-                raw_buffer,
+                seg,
                 collapsed=(agent_work_index < collapse_threshold),
                 thinking_threshold=thinking_threshold,
                 thinking_counter=_thinking_idx,
@@ -1121,8 +1114,9 @@ def messages_to_html(
             if bubble:
                 parts.append(bubble)
             agent_work_index += 1
-            raw_buffer.clear()
+            continue
 
+        i, msg = seg
         role = str(msg.get("role", "user") or "user")
         content = str(msg.get("content", "") or "")
         meta = msg.get("meta")
@@ -1138,7 +1132,7 @@ def messages_to_html(
                 f'style="white-space: pre-wrap;">{escape(content)}</div>'
             )
         else:
-            body_html = format_content_to_html(content)
+            body_html = _format_content_cached(content)
 
         meta_html = f'<div class="meta">{escape(meta)}</div>' if meta else ""
         parts.append(
@@ -1148,43 +1142,30 @@ def messages_to_html(
             f'</div>'
         )
 
-    if raw_buffer:
-        bubble = _render_raw_activity_bubble(
-            raw_buffer,
-            collapsed=(agent_work_index < collapse_threshold),
-            thinking_threshold=thinking_threshold,
-            thinking_counter=_thinking_idx,
-            tools_threshold=tools_threshold,
-            tools_counter=_tools_idx,
-        )
-        if bubble:
-            parts.append(bubble)
-
     return "\n".join(parts)
 
 
 
-def _build_html_document(
-    inner_html: str,
-    theme: dict[str, str] | None = None,
-    scroll_to_bottom: bool = True,
-) -> str:
-    """Wrap inner HTML in the full page template."""
-    defaults: dict[str, str] = {
-        "bg": "#f5f5f7",
-        "text": "#000000",
-        "bubble_user": "#e3f2fd",
-        "bubble_assistant": "#ffffff",
-        "meta_text": "#666666",
-        "border": "#cccccc",
-    }
-    colors = {**defaults}
+# Page colours used for any key a theme omits (or sets to a non-hex value).
+_DEFAULT_THEME_COLORS: dict[str, str] = {
+    "bg": "#f5f5f7",
+    "text": "#000000",
+    "bubble_user": "#e3f2fd",
+    "bubble_assistant": "#ffffff",
+    "meta_text": "#666666",
+    "border": "#cccccc",
+}
+
+
+def _theme_css_vars(theme: dict[str, str] | None) -> str:
+    """Resolve *theme* into the CSS custom properties for ``:root``."""
+    colors = {**_DEFAULT_THEME_COLORS}
     if theme:
         for k, v in theme.items():
             if k in colors and isinstance(v, str) and v.startswith("#"):
                 colors[k] = v
 
-    theme_vars = (
+    return (
         f"    --bg: {colors['bg']};\n"
         f"    --text: {colors['text']};\n"
         f"    --bubble-user: {colors['bubble_user']};\n"
@@ -1193,12 +1174,34 @@ def _build_html_document(
         f"    --border: {colors['border']};"
     )
 
-    html = HTML_TEMPLATE.replace("/* THEME_VARS */", theme_vars)
-    html = html.replace("/* PAGE_NAV_CSS */", _PAGE_NAV_CSS)
-    html = html.replace("{messages_html}", inner_html)
-    scroll_attr = "1" if scroll_to_bottom else "0"
-    html = html.replace("{scroll}", scroll_attr)
-    return html
+
+def _build_html_document(
+    inner_html: str,
+    theme: dict[str, str] | None = None,
+    scroll_to_bottom: bool = True,
+    *,
+    theme_vars: str | None = None,
+) -> str:
+    """Wrap inner HTML in the full page template.
+
+    *theme_vars* is a pre-resolved :func:`_theme_css_vars` block; when
+    given, *theme* is ignored.
+    """
+    if theme_vars is None:
+        theme_vars = _theme_css_vars(theme)
+
+    slots = {
+        "THEME_VARS": theme_vars,
+        "PAGE_NAV_CSS": _PAGE_NAV_CSS,
+        "messages_html": inner_html,
+        "scroll": "1" if scroll_to_bottom else "0",
+    }
+    # A single join over the pre-split template: the (large) message HTML
+    # is never rescanned, and placeholder-like text inside it is left alone.
+    parts = _TEMPLATE_PARTS.copy()
+    for i in range(1, len(parts), 2):
+        parts[i] = slots[parts[i]]
+    return "".join(parts)
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -1233,10 +1236,30 @@ class ChatRenderer(QWidget):
 
         # ── Messages ─────────────────────────────────────────────
         self._messages: list[dict[str, Any]] = []
+        # Indices of human turns in _messages, kept up to date on append;
+        # pagination is derived from it on every render.
+        self._user_idx: list[int] = []
+        # stack_id → tool_stack message, so tool events skip a list scan.
+        self._tool_stacks: dict[str, dict[str, Any]] = {}
+        self._tool_stack_idx: dict[str, int] = {}   # stack_id → index
+        # HTML of the visible page ranges from the last render, reused
+        # while nothing in the range changes.  Messages are only ever
+        # appended, so a range goes stale only when one of its messages
+        # is edited in place — recorded by _mark_changed().
+        self._page_html: dict[tuple[int, int], str] = {}
+        self._page_html_opts: tuple[Any, ...] = ()
+        self._changed_from: int | None = None
+        # Index of the turn last rendered as the live stream target.
+        self._rendered_stream_idx: int | None = None
         self._theme: dict[str, str] | None = None
+        self._theme_vars: str = _theme_css_vars(None)   # resolved once per theme
 
         # ── Pagination ───────────────────────────────────────────
-        s = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
+        # One QSettings for the renderer's lifetime: setters only queue
+        # changes, and Qt writes them out from the event loop (and on
+        # destruction) instead of each call syncing the file itself.
+        self._settings = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
+        s = self._settings
         self._page_size: int = _settings_int(s, "renderer/page_size", 10)
         self._pages_displayed: int = _settings_int(s, "renderer/pages_displayed", 2)
         self._show_thinking: bool = _settings_int(s, "display/show_thinking", 1) == 1
@@ -1262,6 +1285,15 @@ class ChatRenderer(QWidget):
 
         # ── Streaming state ──────────────────────────────────────
         self._assistant_stream_active: bool = False
+        # Direct references into _messages for per-delta updates, so a
+        # delta never has to scan the message list.
+        self._stream_turn: dict[str, Any] | None = None
+        self._stream_turn_idx: int = -1
+        self._last_thinking: dict[str, Any] | None = None
+        self._last_thinking_idx: int = -1
+        # Assistant deltas not yet folded into _stream_turn["content"];
+        # joined once per render instead of concatenated per token.
+        self._stream_parts: list[str] = []
 
         # ── Render control ───────────────────────────────────────
         self._batch_mode: bool = False
@@ -1294,7 +1326,7 @@ class ChatRenderer(QWidget):
         auto_collapse_tools: int | None = None,
     ) -> None:
         """Update pagination settings and persist to QSettings."""
-        s = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
+        s = self._settings
         if page_size is not None and page_size > 0:
             self._page_size = page_size
             s.setValue("renderer/page_size", page_size)
@@ -1310,31 +1342,27 @@ class ChatRenderer(QWidget):
         if auto_collapse_tools is not None and auto_collapse_tools >= 0:
             self._auto_collapse_tools = auto_collapse_tools
             s.setValue("renderer/auto_collapse_tools", auto_collapse_tools)
-        s.sync()
         self._render()
 
     def set_show_thinking(self, val: bool) -> None:
         self._show_thinking = val
-        s = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
-        s.setValue("display/show_thinking", 1 if val else 0)
-        s.sync()
+        self._settings.setValue("display/show_thinking", 1 if val else 0)
         self._render()
 
     def set_show_tools(self, val: bool) -> None:
         self._show_tools = val
-        s = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
-        s.setValue("display/show_tools", 1 if val else 0)
-        s.sync()
+        self._settings.setValue("display/show_tools", 1 if val else 0)
         self._render()
 
     def set_theme(self, theme: dict[str, str] | None) -> None:
         self._theme = theme
+        self._theme_vars = _theme_css_vars(theme)
         self._render()
 
     def persist_zoom(self) -> None:
-        s = QSettings(self._SETTINGS_ORG, self._SETTINGS_KEY)
-        s.setValue("chat/zoom", self._view.zoomFactor())
-        s.sync()
+        # Called from closeEvent, so flush now rather than leave it queued.
+        self._settings.setValue("chat/zoom", self._view.zoomFactor())
+        self._settings.sync()
 
     # ── Zoom (Ctrl+scroll) ────────────────────────────────────────
 
@@ -1371,6 +1399,8 @@ class ChatRenderer(QWidget):
 
         old_page = self._current_page_index()
         self._messages.append(msg)
+        if role == "human":
+            self._user_idx.append(len(self._messages) - 1)
         new_page = self._current_page_index()
 
         # Finalize any in-progress assistant stream.
@@ -1412,34 +1442,35 @@ class ChatRenderer(QWidget):
         self._messages.append(
             {"kind": "turn", "role": "human", "content": text}
         )
+        self._user_idx.append(len(self._messages) - 1)
         self._exec_js("_appendUserBubble(" + json.dumps(escape(text)) + ")")
 
     # ── Thinking API (data model only, no DOM) ─────────────────────
 
     def add_thinking(self, text: str | None = None) -> None:
         """Add a thinking block.  ``text=None`` starts a live accumulation."""
-        self._messages.append({
+        msg: dict[str, Any] = {
             "kind": "thinking",
             "text": text or "",
             "expanded": text is None,
-        })
+        }
+        self._last_thinking_idx = len(self._messages)
+        self._messages.append(msg)
+        self._last_thinking = msg
 
     def append_thinking_delta(self, text: str) -> None:
         """Append text to the last thinking message (in-memory only)."""
-        if not text:
+        msg = self._last_thinking
+        if not text or msg is None:
             return
-        # Find the last thinking message.
-        for msg in reversed(self._messages):
-            if msg.get("kind") == "thinking":
-                msg["text"] = msg.get("text", "") + text
-                break
+        msg["text"] += text
+        self._mark_changed(self._last_thinking_idx)
 
     def end_thinking(self) -> None:
         """Finalize the last thinking block."""
-        for msg in reversed(self._messages):
-            if msg.get("kind") == "thinking":
-                msg["expanded"] = False
-                break
+        if self._last_thinking is not None:
+            self._last_thinking["expanded"] = False
+            self._mark_changed(self._last_thinking_idx)
 
     # ── Tool event API (data model only, no DOM) ──────────────────
 
@@ -1448,6 +1479,7 @@ class ChatRenderer(QWidget):
     ) -> None:
         """Create or update a tool stack (in-memory only)."""
         stack = self._ensure_tool_stack(stack_id)
+        self._mark_changed(self._tool_stack_idx[stack_id])
         event_type = str(event.get("event_type") or "")
         tool_call_id = str(event.get("tool_call_id") or "")
         need_render = False
@@ -1470,9 +1502,6 @@ class ChatRenderer(QWidget):
                 "step": event.get("step"),
                 "args": event.get("args"),
             })
-            args_val = event.get("args")
-            if isinstance(args_val, dict):
-                item["_fmt_args"] = _format_json_block(args_val)
             if existing_status != "pending_approval":
                 item["status"] = "running"
 
@@ -1480,7 +1509,6 @@ class ChatRenderer(QWidget):
             partial = event.get("partial_result", "")
             if partial and partial != item.get("_partial_text"):
                 item["_partial_text"] = partial
-                item["_fmt_stream"] = escape(partial)
                 item["status"] = "running"
                 need_render = True
             details = event.get("details")
@@ -1513,16 +1541,13 @@ class ChatRenderer(QWidget):
                 "error": event.get("error"),
                 "status": status,
             })
-            if result is not None:
-                item["_fmt_result"] = _format_json_block(result)
+            # The result is formatted when rendered (_extract_result_text).
             item.pop("_partial_text", None)
-            item.pop("_fmt_stream", None)
-            details = event.get("details")
-            if isinstance(details, dict):
-                item["_fmt_details"] = _format_subagent_details(details)
             need_render = True
 
-        if need_render:
+        # Tool stacks are omitted from the page while tools are hidden,
+        # so re-rendering would rebuild identical HTML for every event.
+        if need_render and self._show_tools:
             self._request_render()
 
     # ── Streaming assistant API ───────────────────────────────────
@@ -1531,11 +1556,11 @@ class ChatRenderer(QWidget):
         """Start streaming assistant text.  Add the turn to ``_messages``
         immediately so that tool events arrive AFTER it in the list.
         """
-        self._messages.append({
-            "kind": "turn", "role": "you", "content": "",
-        })
+        self._sync_stream_turn()
+        self._stream_turn = {"kind": "turn", "role": "you", "content": ""}
+        self._stream_turn_idx = len(self._messages)
+        self._messages.append(self._stream_turn)
         self._assistant_stream_active = True
-        self._streaming_assistant_content: str = ""
         self._pending_assistant_deltas.clear()
         self._page_loaded = True
         self._exec_js("_beginAssistantBubble()")
@@ -1544,12 +1569,7 @@ class ChatRenderer(QWidget):
         if not self._assistant_stream_active or not text:
             return
 
-        self._streaming_assistant_content += text
-        # Keep the turn in _messages in sync.
-        for msg in reversed(self._messages):
-            if msg.get("kind") == "turn" and msg.get("role") == "you":
-                msg["content"] = msg.get("content", "") + text
-                break
+        self._stream_parts.append(text)
 
         if not self._page_loaded:
             self._pending_assistant_deltas.append(text)
@@ -1565,12 +1585,31 @@ class ChatRenderer(QWidget):
             self._pending_assistant_deltas.clear()
 
         self._assistant_stream_active = False
+        self._sync_stream_turn()
+        self._stream_turn = None
         self._request_render()
 
+    def last_assistant_text(self) -> str:
+        """Return the content of the latest assistant turn (``""`` if none)."""
+        self._sync_stream_turn()
+        for msg in reversed(self._messages):
+            if msg.get("kind") == "turn" and msg.get("role") == "you":
+                return msg.get("content", "")
+        return ""
+
     # ── Clear ─────────────────────────────────────────────────────
 
     def clear(self) -> None:
         self._messages.clear()
+        self._user_idx.clear()
+        self._tool_stacks.clear()
+        self._tool_stack_idx.clear()
+        self._page_html.clear()
+        self._changed_from = None
+        self._rendered_stream_idx = None
+        self._stream_turn = None
+        self._stream_parts.clear()
+        self._last_thinking = None
         self._display_end_page = 0
         self._assistant_stream_active = False
         self._pending_assistant_deltas.clear()
@@ -1578,6 +1617,18 @@ class ChatRenderer(QWidget):
 
     # ── Internal helpers ─────────────────────────────────────────
 
+    def _sync_stream_turn(self) -> None:
+        """Fold buffered assistant deltas into the streaming turn."""
+        if self._stream_parts and self._stream_turn is not None:
+            self._stream_turn["content"] += "".join(self._stream_parts)
+            self._mark_changed(self._stream_turn_idx)
+        self._stream_parts.clear()
+
+    def _mark_changed(self, index: int) -> None:
+        """Record that ``_messages[index]`` was edited in place."""
+        if self._changed_from is None or index < self._changed_from:
+            self._changed_from = index
+
     def _exec_js(self, js: str) -> None:
         self._view.page().runJavaScript(js)
 
@@ -1594,28 +1645,22 @@ class ChatRenderer(QWidget):
     # ── Pagination helpers ────────────────────────────────────────
 
     def _user_message_indices(self) -> list[int]:
-        return [
-            i
-            for i, m in enumerate(self._messages)
-            if isinstance(m, dict)
-            and m.get("kind") == "turn"
-            and m.get("role") == "human"
-        ]
+        return self._user_idx
 
     def _current_page_index(self) -> int:
-        user_idx = self._user_message_indices()
+        user_idx = self._user_idx
         if not user_idx:
             return 0
         return (len(user_idx) - 1) // self._page_size
 
     def _total_pages(self) -> int:
-        user_idx = self._user_message_indices()
+        user_idx = self._user_idx
         if not user_idx:
             return 1
         return max(1, (len(user_idx) + self._page_size - 1) // self._page_size)
 
     def _page_message_range(self, page_index: int) -> tuple[int, int] | None:
-        user_idx = self._user_message_indices()
+        user_idx = self._user_idx
         total = len(user_idx)
         if total == 0:
             if page_index == 0:
@@ -1644,14 +1689,7 @@ class ChatRenderer(QWidget):
     # ── Tool stack management (data model only) ───────────────────
 
     def _find_tool_stack(self, stack_id: str) -> dict[str, Any] | None:
-        for msg in self._messages:
-            if (
-                isinstance(msg, dict)
-                and str(msg.get("kind") or "") == "tool_stack"
-                and str(msg.get("stack_id") or "") == stack_id
-            ):
-                return msg
-        return None
+        return self._tool_stacks.get(stack_id)
 
     def _ensure_tool_stack(self, stack_id: str) -> dict[str, Any]:
         stack = self._find_tool_stack(stack_id)
@@ -1662,7 +1700,9 @@ class ChatRenderer(QWidget):
                 "expanded": False,
                 "items": [],
             }
+            self._tool_stack_idx[stack_id] = len(self._messages)
             self._messages.append(stack)
+            self._tool_stacks[stack_id] = stack
         return stack
 
     def _ensure_tool_stack_item(
@@ -1718,14 +1758,47 @@ class ChatRenderer(QWidget):
         if self._batch_mode:
             return
 
+        self._sync_stream_turn()
+        # Deltas still waiting for the old page are folded into the
+        # stream turn above, so the new page already shows them.
+        self._pending_assistant_deltas.clear()
+
         self._page_loaded = False
 
         # Follow the latest page during streaming.
         if self._assistant_stream_active:
             self._display_end_page = self._current_page_index()
 
-        visible_pages = self._visible_page_indices()
         total_pages = self._total_pages()
+        visible_pages = self._visible_page_indices()
+
+        # A live reply is rendered with the stream target element, so
+        # deltas arriving after this render still have somewhere to go.
+        stream_idx = (
+            self._stream_turn_idx if self._assistant_stream_active else None
+        )
+        if stream_idx != self._rendered_stream_idx:
+            if self._rendered_stream_idx is not None:
+                self._mark_changed(self._rendered_stream_idx)
+            self._rendered_stream_idx = stream_idx
+
+        # A page's HTML depends only on its message range and these
+        # options, so unchanged pages are reused from the last render.
+        opts = (
+            self._auto_collapse_agent_work,
+            self._auto_collapse_thinking,
+            self._auto_collapse_tools,
+            self._show_thinking,
+            self._show_tools,
+        )
+        cached = self._page_html
+        if opts != self._page_html_opts:
+            cached = {}
+        elif self._changed_from is not None:
+            cached = {r: h for r, h in cached.items() if r[1] <= self._changed_from}
+        self._page_html = {}
+        self._page_html_opts = opts
+        self._changed_from = None
 
         # Build page HTML slices.
         page_htmls: list[str] = []
@@ -1733,11 +1806,12 @@ class ChatRenderer(QWidget):
             prange = self._page_message_range(pi)
             if prange is None:
                 continue
-            s, e = prange
-            page_htmls.append(
-                messages_to_html(
+            page_html = cached.get(prange)
+            if page_html is None:
+                s, e = prange
+                page_html = messages_to_html(
                     self._messages,
-                    assistant_stream_index=None,
+                    assistant_stream_index=stream_idx,
                     page_start=s,
                     page_end=e,
                     auto_collapse_count=self._auto_collapse_agent_work,
@@ -1746,7 +1820,8 @@ class ChatRenderer(QWidget):
                     show_thinking=self._show_thinking,
                     show_tools=self._show_tools,
                 )
-            )
+            self._page_html[prange] = page_html
+            page_htmls.append(page_html)
 
         # Build with navigation dividers.
         all_parts: list[str] = []
@@ -1764,8 +1839,8 @@ class ChatRenderer(QWidget):
         messages_html = "\n".join(all_parts)
         html = _build_html_document(
             messages_html,
-            theme=self._theme,
             scroll_to_bottom=self._scroll_to_bottom,
+            theme_vars=self._theme_vars,
         )
         self._scroll_to_bottom = True
         self._view.setHtml(html, QUrl("file:///"))
@@ -1774,11 +1849,7 @@ class ChatRenderer(QWidget):
 
     def _append_stream_delta_js(self, text: str) -> None:
         self._view.page().runJavaScript(
-            "window.thalamusAppendAssistantDelta("
-            + json.dumps("assistant-stream-content")
-            + ","
-            + json.dumps(text)
-            + ");"
+            _STREAM_DELTA_JS_PREFIX + json.dumps(text) + ");"
         )
 
     # ── Page load callback ────────────────────────────────────────
@@ -5,6 +5,9 @@ from __future__ import annotations
 import json
 import math
 import subprocess
+import threading
+import time
+import urllib.request
 from pathlib import Path
 
 from PySide6.QtCore import Qt, QSettings, QTimer, QObject, Signal
@@ -37,7 +40,7 @@ from ui.attachment_bar import AttachmentBar
 from ui.model_dialog import ModelPickerDialog
 from ui.session_dialog import SessionDialog
 from ui.session_confirm_dialog import SessionConfirmDialog
-from ui.settings_dialog import SettingsDialog
+from ui.settings_dialog import SettingsDialog, read_pi_settings
 from ui.voice_controller import VoiceController
 from ui.theme import THEMES
 from ui.widgets import BrainWidget
@@ -88,6 +91,13 @@ class _DownloadWorker(QObject):
 class MainWindow(QWidget):
     """A minimal Qt window connecting PiRPCBridge signals to ChatRenderer."""
 
+    # Emitted from the capability-query thread: (url, model_id, input_modalities).
+    _capabilities_fetched = Signal(str, str, list)
+
+    # Seconds before the post-turn refresh asks pi for its command and
+    # model lists again; both only change on restart or config edits.
+    _CATALOG_TTL_S = 60.0
+
     def __init__(self, bridge: PiRPCBridge, graphics_dir: Path):
         super().__init__()
         self.setWindowTitle("llm_thalamus")
@@ -106,6 +116,12 @@ class MainWindow(QWidget):
         self._current_model_id: str = ""
         self._thinking_level: str = ""
         self._modalities: list[str] = []
+        # Backend-reported modalities per (models URL, model id); they do
+        # not change while the backend runs, so each pair is queried once.
+        self._capabilities_cache: dict[tuple[str, str], list[str]] = {}
+        self._capabilities_inflight: set[tuple[str, str]] = set()
+        # time.monotonic() of the last get_commands/get_available_models.
+        self._catalog_requested_at: float | None = None
 
 
 
@@ -333,7 +349,7 @@ class MainWindow(QWidget):
         bridge.thinking_level_changed.connect(self._on_thinking_level_changed)
 
         # ── async model capability queries ───────────────────────
-        
+        self._capabilities_fetched.connect(self._on_capabilities_fetched)
 
         # brain click opens the RPC event log (placeholder for now)
         self.brain.clicked.connect(lambda: print("[brain] clicked"))
@@ -378,6 +394,7 @@ class MainWindow(QWidget):
         """Save window layout before closing."""
         self._settings.setValue("window/geometry", self.saveGeometry())
         self.chat.persist_zoom()
+        self._voice.shutdown()
         self._bridge.shutdown()
         super().closeEvent(event)
 
@@ -465,12 +482,8 @@ class MainWindow(QWidget):
 
     def _on_system_theme_changed(self) -> None:
         """Re-apply the system theme when the OS switches dark/light mode."""
-        pi_path = Path.home() / ".pi" / "agent" / "settings.json"
-        try:
-            pi = json.loads(pi_path.read_text())
-            if pi.get("theme") != "system":
-                return
-        except (OSError, json.JSONDecodeError):
+        pi = read_pi_settings(Path.home() / ".pi" / "agent" / "settings.json")
+        if pi.get("theme") != "system":
             return
         scheme = QApplication.instance().styleHints().colorScheme()
         tn = "dark" if scheme == Qt.ColorScheme.Dark else "light"
@@ -762,10 +775,9 @@ class MainWindow(QWidget):
         if not path:
             return
         # Resolve CWD, model, and thinking level from session file.
-        cwd = self._read_session_cwd(path) or str(Path.cwd())
+        cwd, provider, model_id, thinking_level = self._read_session_defaults(path)
+        cwd = cwd or str(Path.cwd())
         self._current_session_cwd = cwd
-        model_id, provider = self._read_session_model(path)
-        thinking_level = self._read_session_thinking_level(path)
 
         # Show confirmation dialog.
         if not self._confirm_session_and_apply(
@@ -782,8 +794,10 @@ class MainWindow(QWidget):
     def _on_session_info(self) -> None:
         """Show current session info in a message box."""
         # Request latest state + stats and show once both arrive.
-        self._bridge.send_command({"type": "get_state"})
-        self._bridge.send_command({"type": "get_session_stats"})
+        self._bridge.send_commands([
+            {"type": "get_state"},
+            {"type": "get_session_stats"},
+        ])
 
         # We'll accumulate the results and show them via a helper.
         self._pending_session_info: dict[str, object] = {}
@@ -918,19 +932,20 @@ class MainWindow(QWidget):
         # Apply model selection.
         self._current_model_id = dlg.selected_model_id
         self._provider = dlg.selected_provider
-        self._bridge.send_command({
+        cmds: list[dict] = [{
             "type": "set_model",
             "provider": dlg.selected_provider,
             "modelId": dlg.selected_model_id,
-        })
+        }]
 
         # Apply thinking level.
         if dlg.selected_thinking_level:
             self._thinking_level = dlg.selected_thinking_level
-            self._bridge.send_command({
+            cmds.append({
                 "type": "set_thinking_level",
                 "level": dlg.selected_thinking_level,
             })
+        self._bridge.send_commands(cmds)
 
         # Update status bar immediately.
         parts: list[str] = []
@@ -988,20 +1003,23 @@ class MainWindow(QWidget):
             # set_model/set_thinking_level were sent above but will be
             # lost on restart; re-send them after pi comes back up.
             self._bridge.restart(cwd=str(target))
+            self._catalog_requested_at = None
             self.chat.clear()
             self._current_session_path = None
             self._refresh_session_list()
             # Single delayed call after bridge restart.
             QTimer.singleShot(1000, lambda: (
-                self._bridge.send_command({
-                    "type": "set_model",
-                    "provider": self._provider,
-                    "modelId": self._current_model_id,
-                }),
-                self._bridge.send_command({
-                    "type": "set_thinking_level",
-                    "level": self._thinking_level,
-                }),
+                self._bridge.send_commands([
+                    {
+                        "type": "set_model",
+                        "provider": self._provider,
+                        "modelId": self._current_model_id,
+                    },
+                    {
+                        "type": "set_thinking_level",
+                        "level": self._thinking_level,
+                    },
+                ]),
                 self._refresh_status_bar(),
                 self._bridge.send_command({"type": "new_session"}),
             ))
@@ -1030,12 +1048,9 @@ class MainWindow(QWidget):
 
     def _on_copy_last(self) -> None:
         """Copy the last assistant message to clipboard."""
-        for msg in reversed(self.chat._messages):
-            if msg.get("kind") == "turn" and msg.get("role") == "you":
-                text = msg.get("content", "")
-                if text:
-                    QApplication.clipboard().setText(text)
-                break
+        text = self.chat.last_assistant_text()
+        if text:
+            QApplication.clipboard().setText(text)
 
     def _on_compact(self) -> None:
         """Send the compact RPC to compress context."""
@@ -1053,6 +1068,7 @@ class MainWindow(QWidget):
             cwd=str(Path.cwd()),
             session_path=self._current_session_path,
         )
+        self._catalog_requested_at = None
         self.chat.clear()
         self._refresh_session_list()
         # Single delayed call after bridge restart.
@@ -1063,10 +1079,9 @@ class MainWindow(QWidget):
     def _on_switch_session(self, session_path: str) -> None:
         """Switch to a different session and reload conversation."""
         # Resolve CWD, model, and thinking level from session file.
-        cwd = self._read_session_cwd(session_path) or str(Path.cwd())
+        cwd, provider, model_id, thinking_level = self._read_session_defaults(session_path)
+        cwd = cwd or str(Path.cwd())
         self._current_session_cwd = cwd
-        model_id, provider = self._read_session_model(session_path)
-        thinking_level = self._read_session_thinking_level(session_path)
 
         # Show confirmation dialog.
         if not self._confirm_session_and_apply(
@@ -1398,36 +1413,55 @@ class MainWindow(QWidget):
         capability info (input_modalities).  Only known to work with
         llama.cpp; other providers are skipped.
 
-        Queries synchronously — for a local backend this is < 50 ms.
+        The request runs on a daemon thread so a slow or unreachable
+        backend never stalls the UI; the result comes back through
+        :attr:`_capabilities_fetched`.
         """
-        import json, urllib.request
-
         url = base_url.rstrip("/") + "/models"
         if "localhost" not in url and "127.0.0.1" not in url:
             return
 
-        try:
-            req = urllib.request.Request(url, headers={"Accept": "application/json"})
-            with urllib.request.urlopen(req, timeout=3) as resp:
-                data = json.loads(resp.read().decode())
-        except (OSError, json.JSONDecodeError, ValueError):
+        key = (url, model_id)
+        cached = self._capabilities_cache.get(key)
+        if cached is not None:
+            self._merge_modalities(model_id, cached)
+            return
+        if key in self._capabilities_inflight:
             return
+        self._capabilities_inflight.add(key)
 
-        for entry in data.get("data", []):
-            if entry.get("id") == model_id:
-                arch = entry.get("architecture", {})
-                modalities = arch.get("input_modalities", [])
-                if isinstance(modalities, list):
-                    merged = list(self._modalities)
-                    changed = False
-                    for m in modalities:
-                        if m not in merged:
-                            merged.append(m)
-                            changed = True
-                    if changed:
-                        self._modalities = merged
-                        self._update_modality_icons()
-                break
+        def _worker() -> None:
+            modalities = _fetch_input_modalities(url, model_id)
+            self._capabilities_fetched.emit(url, model_id, modalities)
+
+        threading.Thread(
+            target=_worker, name="capabilities-query", daemon=True
+        ).start()
+
+    def _on_capabilities_fetched(
+        self, url: str, model_id: str, modalities: list
+    ) -> None:
+        """Cache a finished capability query and apply it."""
+        key = (url, model_id)
+        self._capabilities_inflight.discard(key)
+        if not modalities:
+            return  # unreachable or unknown model: retry on the next query
+        self._capabilities_cache[key] = modalities
+        self._merge_modalities(model_id, modalities)
+
+    def _merge_modalities(self, model_id: str, modalities: list) -> None:
+        """Merge backend-reported modalities into the current model's set."""
+        if model_id != self._current_model_id:
+            return  # model changed while the query was in flight
+        merged = list(self._modalities)
+        changed = False
+        for m in modalities:
+            if m not in merged:
+                merged.append(m)
+                changed = True
+        if changed:
+            self._modalities = merged
+            self._update_modality_icons()
 
     def _on_history_turn(self, role: str, content: str, _ts: str) -> None:
         # Map pi roles to chat renderer roles.
@@ -1529,7 +1563,11 @@ class MainWindow(QWidget):
 
         When *text* is non-empty, store/update the entry for *key*.
         When *text* is empty, remove the entry (status was cleared).
+        Repeats of the current value (extensions often re-send the same
+        status on every tick) leave the label untouched.
         """
+        if self._status_entries.get(key) == (text or None):
+            return
         if text:
             self._status_entries[key] = text
         else:
@@ -1638,10 +1676,17 @@ class MainWindow(QWidget):
         """Request fresh state and stats from pi; update local info."""
         self._update_path_label()
         self._refresh_session_list()
-        self._bridge.send_command({"type": "get_state"})
-        self._bridge.send_command({"type": "get_session_stats"})
-        self._bridge.send_command({"type": "get_commands"})
-        self._bridge.send_command({"type": "get_available_models"})
+        cmds: list[dict] = [
+            {"type": "get_state"},
+            {"type": "get_session_stats"},
+        ]
+        now = time.monotonic()
+        last = self._catalog_requested_at
+        if last is None or now - last >= self._CATALOG_TTL_S:
+            self._catalog_requested_at = now
+            cmds.append({"type": "get_commands"})
+            cmds.append({"type": "get_available_models"})
+        self._bridge.send_commands(cmds)
 
     def _update_path_label(self) -> None:
         """Update the path label with active session's CWD and optional git branch.
@@ -1665,74 +1710,124 @@ class MainWindow(QWidget):
     @staticmethod
     def _read_session_cwd(session_file: str) -> str | None:
         """Read ``cwd`` from a session file's JSONL header (first line)."""
-        import json
         try:
             with open(session_file, "r", encoding="utf-8") as f:
-                first = f.readline()
-            if not first:
-                return None
-            header = json.loads(first)
-            cwd = header.get("cwd")
-            return str(cwd) if cwd else None
-        except (OSError, json.JSONDecodeError, ValueError):
+                return _session_header_cwd(f.readline())
+        except (OSError, ValueError):
             return None
 
     @staticmethod
-    def _read_session_model(session_file: str) -> tuple[str, str]:
-        """Read the last ``model_change`` entry from a session file.
-
-        Returns ``(provider, model_id)``, or ``("", "")`` if none found.
+    def _read_session_defaults(
+        session_file: str,
+    ) -> tuple[str | None, str, str, str]:
+        """Read a session's cwd, model and thinking level in one pass.
+
+        Returns ``(cwd, provider, model_id, thinking_level)``: ``cwd`` from
+        the JSONL header (``None`` if missing), the rest from the last
+        ``model_change`` / ``thinking_level_change`` entries (``""`` if
+        none).  Only lines that can hold one of those entries are parsed,
+        so large message lines (inline images, audio) are skipped cheaply.
         """
-        import json
+        cwd: str | None = None
         provider = ""
         model_id = ""
+        level = ""
         try:
             with open(session_file, "r", encoding="utf-8") as f:
-                for line in f:
+                for lineno, line in enumerate(f):
+                    if lineno == 0:
+                        cwd = _session_header_cwd(line)
+                        continue
+                    if "_change" not in line:
+                        continue
                     try:
                         entry = json.loads(line)
                     except json.JSONDecodeError:
                         continue
-                    if entry.get("type") == "model_change":
+                    if not isinstance(entry, dict):
+                        continue
+                    etype = entry.get("type")
+                    if etype == "model_change":
                         pid = entry.get("provider", "")
                         mid = entry.get("modelId", "")
                         if pid and mid:
                             provider = str(pid)
                             model_id = str(mid)
-        except (OSError, json.JSONDecodeError, ValueError):
-            pass
-        return provider, model_id
-
-    @staticmethod
-    def _read_session_thinking_level(session_file: str) -> str:
-        """Read the last ``thinking_level_change`` entry from a session file.
-
-        Returns the level string, or ``""`` if none found.
-        """
-        import json
-        level = ""
-        try:
-            with open(session_file, "r", encoding="utf-8") as f:
-                for line in f:
-                    try:
-                        entry = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-                    if entry.get("type") == "thinking_level_change":
+                    elif etype == "thinking_level_change":
                         lv = entry.get("thinkingLevel", "")
                         if lv:
                             level = str(lv)
-        except (OSError, json.JSONDecodeError, ValueError):
+        except (OSError, ValueError):
             pass
-        return level
+        return cwd, provider, model_id, level
 
 
 
 # ── helpers ──────────────────────────────────────────────────────────
 
 
+def _session_header_cwd(line: str) -> str | None:
+    """Return the ``cwd`` recorded in a session file's JSONL header *line*."""
+    try:
+        header = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(header, dict):
+        return None
+    cwd = header.get("cwd")
+    return str(cwd) if cwd else None
+
+
+# cwd -> (HEAD signature, branch); see _git_branch.
+_git_branch_cache: dict[Path, tuple[tuple[int, ...], str]] = {}
+
+
+def _git_head_signature(cwd: Path) -> tuple[int, ...] | None:
+    """Return mtimes of the git files that change when *cwd*'s branch does.
+
+    Returns None when *cwd* is not inside a git work tree.
+    """
+    for d in (cwd, *cwd.parents):
+        dot_git = d / ".git"
+        if dot_git.is_dir():
+            git_dir = dot_git
+        elif dot_git.is_file():
+            # Worktrees and submodules: ".git" holds "gitdir: <path>".
+            try:
+                text = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if not text.startswith("gitdir:"):
+                return None
+            git_dir = d / text[len("gitdir:"):].strip()
+        else:
+            continue
+        # The git dir itself changes on any ref/index update (lock-file
+        # renames), which also covers the first commit on an unborn branch.
+        sig: list[int] = []
+        for f in (git_dir, git_dir / "HEAD", git_dir / "reftable" / "tables.list"):
+            try:
+                sig.append(f.stat().st_mtime_ns)
+            except OSError:
+                sig.append(0)
+        return tuple(sig)
+    return None
+
+
 def _git_branch(cwd: Path) -> str:
-    """Return the current git branch name, or empty string on failure."""
+    """Return the current git branch name, or empty string on failure.
+
+    The path label refreshes after every agent turn; the ``git`` call is
+    only repeated when the repository's HEAD has changed since the last
+    lookup for *cwd*.
+    """
+    sig = _git_head_signature(cwd)
+    if sig is None:
+        return ""
+    cached = _git_branch_cache.get(cwd)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--abbrev-ref", "HEAD"],
@@ -1741,12 +1836,36 @@ def _git_branch(cwd: Path) -> str:
             cwd=cwd,
             timeout=2,
         )
-        branch = result.stdout.strip()
-        if result.returncode == 0 and branch and branch != "HEAD":
-            return branch
     except (OSError, subprocess.TimeoutExpired, ValueError):
-        pass
-    return ""
+        return ""  # transient — retry on the next refresh
+    branch = result.stdout.strip()
+    if result.returncode != 0 or branch == "HEAD":
+        branch = ""
+    _git_branch_cache[cwd] = (sig, branch)
+    return branch
+
+
+def _fetch_input_modalities(url: str, model_id: str) -> list[str]:
+    """Return *model_id*'s ``input_modalities`` from a /v1/models *url*.
+
+    Blocking — call from a worker thread.  Returns an empty list when the
+    backend is unreachable or does not report the model.
+    """
+    try:
+        req = urllib.request.Request(url, headers={"Accept": "application/json"})
+        with urllib.request.urlopen(req, timeout=3) as resp:
+            data = json.loads(resp.read().decode())
+    except (OSError, json.JSONDecodeError, ValueError):
+        return []
+
+    for entry in data.get("data", []):
+        if entry.get("id") == model_id:
+            arch = entry.get("architecture", {})
+            modalities = arch.get("input_modalities", [])
+            if isinstance(modalities, list):
+                return [str(m) for m in modalities]
+            break
+    return []
 
 
 def _fmt_tokens(count: int) -> str:
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import json
+import subprocess
+import threading
 from pathlib import Path
 
 from PySide6.QtCore import Qt, QSettings, Signal
@@ -117,6 +119,56 @@ def _sr(label: str, cur: int, mn: int, mx: int) -> tuple[QHBoxLayout, QSpinBox]:
     return r, sp
 
 
+# ── pi settings.json reader ───────────────────────────────────────
+
+# path -> ((st_mtime_ns, st_size), parsed settings)
+_pi_settings_cache: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+
+def read_pi_settings(path: Path) -> dict:
+    """Return the parsed pi ``settings.json`` at *path*, or ``{}``.
+
+    The dialog reads the file once per tab and again on apply, and the
+    main window on every OS theme switch, so the parse is cached against
+    the file's mtime and size and only redone when the file changes.
+    The returned dict is shared — copy it before modifying.
+    """
+    try:
+        st = path.stat()
+    except OSError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _pi_settings_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    _pi_settings_cache[path] = (key, data)
+    return data
+
+
+def _scan_tts_models() -> dict | None:
+    """Return ``{model: cached}`` from the coqui-tts helper script.
+
+    Blocking — call from a worker thread.  Returns ``None`` when the
+    helper is missing or its output is not a JSON object.
+    """
+    script = str(
+        Path.home() / ".pi" / "agent" / "extensions" / "bin" / "tts_models.py"
+    )
+    try:
+        result = subprocess.run(
+            ["/opt/coqui-tts/venv/bin/python3", script],
+            capture_output=True, text=True, timeout=30,
+        )
+        data = json.loads(result.stdout)
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  SettingsDialog
 # ═══════════════════════════════════════════════════════════════════
@@ -131,6 +183,8 @@ class SettingsDialog(QDialog):
     """
 
     restart_requested = Signal()
+    # {model: cached} from a background TTS scan, or None if it failed.
+    _tts_models_scanned = Signal(object)
 
     def __init__(
         self,
@@ -152,6 +206,8 @@ class SettingsDialog(QDialog):
         self._settings = QSettings("llm-thalamus", "llm-thalamus")
         self._pi_settings_path = Path.home() / ".pi" / "agent" / "settings.json"
         self._initial_cfg_dir = bridge_config_dir or ""
+        self._tts_scan_running = False
+        self._tts_models_scanned.connect(self._on_tts_models_scanned)
 
         self._build_ui(default_tab)
 
@@ -609,18 +665,30 @@ class SettingsDialog(QDialog):
     # ── TTS model scanning ────────────────────────────────────
 
     def _on_scan_tts_models(self) -> None:
-        """Query coqui-tts for all models and mark which are cached."""
-        import subprocess
-        script = str(
-            Path.home() / ".pi" / "agent" / "extensions" / "bin" / "tts_models.py"
-        )
-        try:
-            result = subprocess.run(
-                ["/opt/coqui-tts/venv/bin/python3", script],
-                capture_output=True, text=True, timeout=30,
-            )
-            data = json.loads(result.stdout)
-        except Exception:
+        """Query coqui-tts for all models and mark which are cached.
+
+        The query starts a Python interpreter that imports coqui-tts and
+        can take many seconds, so it runs on a daemon thread; the result
+        comes back through :attr:`_tts_models_scanned`.
+        """
+        if self._tts_scan_running:
+            return
+        self._tts_scan_running = True
+
+        def _worker() -> None:
+            data = _scan_tts_models()
+            try:
+                self._tts_models_scanned.emit(data)
+            except RuntimeError:
+                pass  # dialog already destroyed
+
+        threading.Thread(
+            target=_worker, name="tts-model-scan", daemon=True
+        ).start()
+
+    def _on_tts_models_scanned(self, data: object) -> None:
+        self._tts_scan_running = False
+        if not isinstance(data, dict):
             QMessageBox.warning(self, "Scan Error",
                                 "Could not query coqui-tts models.")
             return
@@ -859,7 +927,4 @@ class SettingsDialog(QDialog):
     # ── helpers ─────────────────────────────────────────────────
 
     def _read_pi_settings(self) -> dict:
-        try:
-            return json.loads(self._pi_settings_path.read_text())
-        except (OSError, json.JSONDecodeError):
-            return {}
+        return read_pi_settings(self._pi_settings_path)
@@ -8,8 +8,12 @@ or send raw audio (Direct mode).  Emits signals for the results; the parent
 from __future__ import annotations
 
 import base64
+import io
 import os
+import secrets
+import time
 import wave
+from collections import deque
 from pathlib import Path
 
 from PySide6.QtCore import QObject, QSettings, QThread, QTimer, Signal
@@ -17,6 +21,7 @@ from PySide6.QtMultimedia import QAudioSource, QAudioFormat, QMediaDevices
 from PySide6.QtWidgets import QApplication, QMessageBox
 
 from controller.stt import SttBackend, model_size_human
+from ui.widgets import FILE_TS_FMT
 
 
 # ── Worker for background model downloads ───────────────────────
@@ -41,6 +46,77 @@ class _DownloadWorker(QObject):
             self.error.emit(str(exc))
 
 
+# ── Worker for background model preloading ──────────────────────
+
+
+class _PreloadWorker(QObject):
+    """Loads an STT model into memory in a background thread."""
+
+    finished = Signal()
+
+    def __init__(self, backend: SttBackend, model: str) -> None:
+        super().__init__()
+        self._backend = backend
+        self._model = model
+
+    def run(self) -> None:
+        try:
+            self._backend.preload_model(self._model)
+        except Exception:
+            # Best effort — transcribe() loads the model again and
+            # reports any error itself.
+            pass
+        self.finished.emit()
+
+
+# ── Worker for background transcription ─────────────────────────
+
+# Recordings queued behind a running transcription; later ones are dropped.
+_MAX_PENDING_TRANSCRIPTIONS = 8
+
+
+class _TranscribeWorker(QObject):
+    """Transcribes a WAV file in a background thread, then deletes it."""
+
+    finished = Signal(str)   # transcribed text
+    error = Signal(str)      # error message on failure
+
+    def __init__(
+        self,
+        backend: SttBackend,
+        file_path: str,
+        model: str,
+        task: str,
+        language: str | None,
+    ) -> None:
+        super().__init__()
+        self._backend = backend
+        self._file_path = file_path
+        self._model = model
+        self._task = task
+        self._language = language
+
+    def run(self) -> None:
+        try:
+            text = self._backend.transcribe(
+                self._file_path, model=self._model,
+                task=self._task, language=self._language,
+            )
+        except Exception as exc:
+            _unlink_quietly(self._file_path)
+            self.error.emit(str(exc))
+            return
+        _unlink_quietly(self._file_path)
+        self.finished.emit(text)
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
 # ── VoiceController ────────────────────────────────────────────
 
 
@@ -86,6 +162,13 @@ class VoiceController(QObject):
         self._audio_format: QAudioFormat | None = None
         self._recording_file: str = ""
 
+        # ── transcription state ────────────────────────────────
+        self._transcribe_thread: QThread | None = None
+        self._transcribe_worker: _TranscribeWorker | None = None
+        self._transcribe_pending: deque[tuple[str, str]] = deque()  # (file_path, model)
+        self._preload_thread: QThread | None = None
+        self._preload_worker: _PreloadWorker | None = None
+
         # ── wire button ────────────────────────────────────────
         self._btn = voice_button
         self._btn.pressed.connect(self._on_pressed)
@@ -102,6 +185,21 @@ class VoiceController(QObject):
         self._recording_mode = self._settings.value("stt/voice_mode", "stt")
         self._btn.setText("\U0001f3a4 STT" if self._recording_mode == "stt" else "\U0001f3a4 Voice")
 
+    def shutdown(self) -> None:
+        """Drop queued recordings and wait for running worker threads.
+
+        The backend call inside a worker cannot be interrupted, and a
+        QThread destroyed while still running aborts the process, so the
+        wait has no timeout.
+        """
+        for file_path, _model in self._transcribe_pending:
+            _unlink_quietly(file_path)
+        self._transcribe_pending.clear()
+        for thread in (self._transcribe_thread, self._preload_thread):
+            if thread is not None and thread.isRunning():
+                thread.quit()
+                thread.wait()
+
     # ── recording lifecycle ─────────────────────────────────────
 
     def _start_recording(self, out_path: str) -> None:
@@ -132,8 +230,7 @@ class VoiceController(QObject):
 
     def _on_pressed(self) -> None:
         """Voice button pressed — start recording."""
-        from PySide6.QtCore import QDateTime
-        ts = QDateTime.currentDateTime().toString("yyyy-MM-dd_hh-mm-ss")
+        ts = time.strftime(FILE_TS_FMT)
         mode = self._settings.value("stt/voice_mode", "stt")
         self._recording_mode = mode
 
@@ -141,8 +238,11 @@ class VoiceController(QObject):
             out_path = str(self._attach_dir / f"recording-{ts}.wav")
             tip = "Recording\u2026 release to send"
         else:
-            out_path = f"/tmp/llm-thalamus-recording-{ts}.wav"
+            # Suffixed so a recording queued for transcription is never
+            # overwritten by another one started within the same second.
+            out_path = f"/tmp/llm-thalamus-recording-{ts}-{secrets.token_hex(4)}.wav"
             tip = "Recording\u2026 release to transcribe"
+            self._preload_model()
 
         self._start_recording(out_path)
         self._btn.setText("\U0001f3a4 \u25a0")
@@ -175,15 +275,19 @@ class VoiceController(QObject):
             self._recording_file = ""
             return
 
-        with wave.open(file_path, "wb") as wf:
+        # Build the WAV in memory: it is written once and, in Direct mode,
+        # base64-encoded from the same bytes instead of read back from disk.
+        wav_io = io.BytesIO()
+        with wave.open(wav_io, "wb") as wf:
             wf.setnchannels(1)
             wf.setsampwidth(2)
             wf.setframerate(16000)
             wf.writeframes(raw_data.data())
+        wav_bytes = wav_io.getvalue()
+        Path(file_path).write_bytes(wav_bytes)
 
         if self._recording_mode == "direct":
-            with open(file_path, "rb") as f:
-                b64 = base64.b64encode(f.read()).decode()
+            b64 = base64.b64encode(wav_bytes).decode()
             self.audio_ready.emit(file_path, b64)
         else:
             self._transcribe_file(file_path)
@@ -197,16 +301,53 @@ class VoiceController(QObject):
         if self._stt_backend is None:
             return
 
-        model = self._settings.value("stt/model", "base")
-        if not isinstance(model, str):
-            model = "base"
-
+        model = self._stt_model()
         if not self._stt_backend.is_model_downloaded(model):
             self._download_and_transcribe(file_path, model)
             return
 
         self._do_transcribe(file_path, model)
 
+    def _stt_model(self) -> str:
+        model = self._settings.value("stt/model", "base")
+        return model if isinstance(model, str) else "base"
+
+    def _preload_model(self) -> None:
+        """Start loading the STT model while the user is still speaking.
+
+        Otherwise the first transcription pays the model load (seconds)
+        only after release.  Skipped when the model is not downloaded
+        yet (release handles that) or a transcription already has it.
+        """
+        if (self._stt_backend is None
+                or self._preload_thread is not None
+                or self._transcribe_thread is not None):
+            return
+        model = self._stt_model()
+        if not self._stt_backend.is_model_downloaded(model):
+            return
+
+        thread = QThread(self)
+        worker = _PreloadWorker(self._stt_backend, model)
+        worker.moveToThread(thread)
+        self._preload_thread = thread
+        self._preload_worker = worker
+
+        worker.finished.connect(self._on_preloaded)
+        thread.started.connect(worker.run)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def _on_preloaded(self) -> None:
+        thread = self._preload_thread
+        if thread is not None:
+            thread.quit()
+            if thread.isRunning():
+                thread.wait(3000)
+        self._preload_thread = None
+        self._preload_worker = None
+
     def _download_and_transcribe(self, file_path: str, model: str) -> None:
         """Download *model*, then transcribe *file_path*."""
         from PySide6.QtWidgets import QProgressDialog
@@ -249,7 +390,19 @@ class VoiceController(QObject):
         thread.start()
 
     def _do_transcribe(self, file_path: str, model: str) -> None:
-        """Transcribe *file_path* using *model* and emit result."""
+        """Transcribe *file_path* using *model* on a worker thread.
+
+        Only one transcription runs at a time (the backend shares a single
+        model instance); recordings made meanwhile are queued.
+        """
+        if self._transcribe_thread is not None:
+            if len(self._transcribe_pending) < _MAX_PENDING_TRANSCRIPTIONS:
+                self._transcribe_pending.append((file_path, model))
+            else:
+                _unlink_quietly(file_path)
+                self.error.emit("Too many recordings waiting to be transcribed.")
+            return
+
         task_raw = self._settings.value("stt/task", "Transcribe")
         task = "translate" if str(task_raw) == "Translate to English" else "transcribe"
         lang_raw = self._settings.value("stt/language", "auto")
@@ -257,28 +410,41 @@ class VoiceController(QObject):
 
         self._btn.setText("\U0001f3a4 \u2026")
         self._btn.setToolTip("Transcribing\u2026")
-        QApplication.processEvents()
 
-        try:
-            text = self._stt_backend.transcribe(
-                file_path, model=model, task=task, language=lang,
-            )
-        except Exception as exc:
-            self._btn.setText("\U0001f3a4 STT")
-            self._btn.setToolTip("Hold to record, release to process")
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
-            self.error.emit(str(exc))
-            return
+        thread = QThread(self)
+        worker = _TranscribeWorker(self._stt_backend, file_path, model, task, lang)
+        worker.moveToThread(thread)
+        self._transcribe_thread = thread
+        self._transcribe_worker = worker
 
-        self._btn.setText("\U0001f3a4 STT")
-        self._btn.setToolTip("Hold to record, release to process")
-        try:
-            os.unlink(file_path)
-        except OSError:
-            pass
+        # Bound methods of this QObject, so results are queued to the UI thread.
+        worker.finished.connect(self._on_transcribed)
+        worker.error.connect(self._on_transcribe_error)
+        thread.started.connect(worker.run)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
 
+    def _on_transcribed(self, text: str) -> None:
+        self._finish_transcription()
         if text:
             self.transcription_ready.emit(text)
+
+    def _on_transcribe_error(self, err: str) -> None:
+        self._finish_transcription()
+        self.error.emit(err)
+
+    def _finish_transcription(self) -> None:
+        """Stop the finished worker thread and start the next queued job."""
+        thread = self._transcribe_thread
+        if thread is not None:
+            thread.quit()
+            if thread.isRunning():
+                thread.wait(3000)
+        self._transcribe_thread = None
+        self._transcribe_worker = None
+        if self._transcribe_pending:
+            self._do_transcribe(*self._transcribe_pending.popleft())
+        else:
+            self._btn.setText("\U0001f3a4 STT")
+            self._btn.setToolTip("Hold to record, release to process")
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import json
+import os
+import time
+from functools import lru_cache
 from pathlib import Path
 
 from PySide6 import QtCore, QtGui, QtWidgets
@@ -8,6 +11,10 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from .theme import THINKING_COLORS
 
 
+# strftime pattern for recording and pasted-image file names (local time).
+FILE_TS_FMT = "%Y-%m-%d_%H-%M-%S"
+
+
 # Shared zoom state for the chat input font size.
 _input_zoom: float = 1.0
 _base_input_size: int = 0  # set once on first zoom
@@ -61,7 +68,7 @@ class ChatInput(QtWidgets.QPlainTextEdit):
                 from pathlib import Path
                 attach_dir = Path.home() / ".pi" / "agent" / "sessions" / "attachments"
                 attach_dir.mkdir(parents=True, exist_ok=True)
-                ts = QtCore.QDateTime.currentDateTime().toString("yyyy-MM-dd_hh-mm-ss")
+                ts = time.strftime(FILE_TS_FMT)
                 out_path = str(attach_dir / f"pasted-image-{ts}.png")
                 img.save(out_path, "PNG")
                 # Find the parent AttachmentBar
@@ -295,6 +302,46 @@ def _trim_label(text: str, max_len: int = 55) -> str:
     return text[:max_len].rstrip() + "…"
 
 
+# The session tree is rebuilt after every turn while the session dialog is
+# open, so values read from session files are cached against each file's
+# mtime and size.  path -> ((st_mtime_ns, st_size), value)
+_session_cwd_cache: dict[str, tuple[tuple[int, int], str | None]] = {}
+_first_message_cache: dict[str, tuple[tuple[int, int], str]] = {}
+# Subagent run dir -> agent name from its meta file.  Meta files are
+# written once per run, so only successful reads are cached.
+_fork_agent_cache: dict[str, str] = {}
+
+
+def _stat_key(path: str | Path) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _session_header_cwd(path: str) -> str | None:
+    """Return the ``cwd`` recorded in a session file's JSONL header."""
+    key = _stat_key(path)
+    if key is None:
+        return None
+    cached = _session_cwd_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    cwd: str | None = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.readline()
+        if first:
+            actual = json.loads(first).get("cwd")
+            if actual:
+                cwd = str(actual)
+    except (OSError, json.JSONDecodeError, ValueError, AttributeError):
+        pass
+    _session_cwd_cache[path] = (key, cwd)
+    return cwd
+
+
 class SessionListWidget(QtWidgets.QWidget):
     """
     Session list panel for the right sidebar — 4-level QTreeWidget.
@@ -406,8 +453,19 @@ class SessionListWidget(QtWidgets.QWidget):
 
     @staticmethod
     def _get_first_message(path: Path) -> str:
-        """Read the first user message from *path*. Returns empty string if
-        no user message is found."""
+        """Read the first user message from *path*. Returns the file stem
+        if no user message is found."""
+        key = _stat_key(path)
+        cached = _first_message_cache.get(str(path))
+        if key is not None and cached is not None and cached[0] == key:
+            return cached[1]
+        text = SessionListWidget._read_first_message(path)
+        if key is not None:
+            _first_message_cache[str(path)] = (key, text)
+        return text
+
+    @staticmethod
+    def _read_first_message(path: Path) -> str:
         try:
             with open(path, "r", encoding="utf-8") as f:
                 for line in f:
@@ -441,6 +499,10 @@ class SessionListWidget(QtWidgets.QWidget):
         """Return agent label for a fork. Reads agent name from the
         ``subagent-artifacts/<run_id>_*_meta.json`` file. Falls back to
         the run ID directory name."""
+        run_dir = str(fork_path.parent.parent)
+        cached = _fork_agent_cache.get(run_dir)
+        if cached is not None:
+            return cached
         run_id = fork_path.parent.parent.name
         # Walk up to find subagent-artifacts/ and the matching meta file
         for parent in fork_path.parents:
@@ -451,9 +513,11 @@ class SessionListWidget(QtWidgets.QWidget):
                     if f.name.startswith(prefix) and f.suffix == ".json":
                         try:
                             data = json.loads(f.read_text(encoding="utf-8"))
-                            return data.get("agent", run_id)[:20]
+                            name = data.get("agent", run_id)[:20]
                         except (OSError, json.JSONDecodeError):
-                            pass
+                            continue
+                        _fork_agent_cache[run_dir] = name
+                        return name
                 break
         return run_id[:16]
 
@@ -511,23 +575,13 @@ class SessionListWidget(QtWidgets.QWidget):
         # The inferred CWD (decoded from directory name) is lossy for
         # directories containing hyphens.  Read one session file per
         # CWD group to get the true path from the JSONL header.
-        import os
         real_cwd: dict[str, tuple[str, bool]] = {}  # inferred → (real_path, exists)
         for inferred, infos in cwd_sessions.items():
             for info in infos:
-                try:
-                    with open(info["path"], "r", encoding="utf-8") as f:
-                        first = f.readline()
-                    if first:
-                        import json
-                        header = json.loads(first)
-                        actual = header.get("cwd")
-                        if actual:
-                            rp = str(actual)
-                            real_cwd[inferred] = (rp, os.path.isdir(rp))
-                            break
-                except (OSError, json.JSONDecodeError, ValueError):
-                    continue
+                rp = _session_header_cwd(info["path"])
+                if rp:
+                    real_cwd[inferred] = (rp, os.path.isdir(rp))
+                    break
             # If no session file could be read, keep the inferred path.
             if inferred not in real_cwd:
                 real_cwd[inferred] = (inferred, os.path.isdir(inferred))
@@ -912,8 +966,13 @@ class SessionListWidget(QtWidgets.QWidget):
             _unbold(self._tree.topLevelItem(i))
 
     @staticmethod
+    @lru_cache(maxsize=256)
     def _format_cwd_label(cwd_path: str) -> str:
-        """Return a short display label for a working directory path."""
+        """Return a short display label for a working directory path.
+
+        Memoised: both ``resolve()`` calls walk the filesystem, and the
+        session list relabels every directory on each refresh.
+        """
         try:
             p = Path(cwd_path).resolve()
             home = Path.home().resolve()
@@ -1195,8 +1254,7 @@ class ThalamusLogWindow(QtWidgets.QWidget):
             return
 
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.text_edit.toPlainText())
+            Path(filename).write_text(self.text_edit.toPlainText(), encoding="utf-8")
         except Exception as e:
             QtWidgets.QMessageBox.warning(
                 self, "Error", f"Failed to save log:\n{e}"
@@ -1258,8 +1316,7 @@ class ThoughtLogWindow(QtWidgets.QWidget):
             return
 
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.text_edit.toPlainText())
+            Path(filename).write_text(self.text_edit.toPlainText(), encoding="utf-8")
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Error", f"Failed to save log:\n{e}")
 
@@ -1391,8 +1448,7 @@ class CombinedLogsWindow(QtWidgets.QWidget):
         if not filename:
             return
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.thalamus_edit.toPlainText())
+            Path(filename).write_text(self.thalamus_edit.toPlainText(), encoding="utf-8")
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Error", f"Failed to save log:\n{e}")
 
@@ -1423,8 +1479,7 @@ class CombinedLogsWindow(QtWidgets.QWidget):
         if not filename:
             return
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.thinking_edit.toPlainText())
+            Path(filename).write_text(self.thinking_edit.toPlainText(), encoding="utf-8")
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Error", f"Failed to save log:\n{e}")
 
@@ -1456,8 +1511,7 @@ class CombinedLogsWindow(QtWidgets.QWidget):
         if not filename:
             return
         try:
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(self.prompts_edit.toPlainText())
+            Path(filename).write_text(self.prompts_edit.toPlainText(), encoding="utf-8")
         except Exception as e:
             QtWidgets.QMessageBox.warning(self, "Error", f"Failed to save log:\n{e}")
     # --- world/state panes ---
@@ -18,12 +18,12 @@ from ui.chat_renderer import (
     HTML_TEMPLATE,
     _build_html_document,
     _extract_result_text,
-    _fmt_tokens,
-    _format_json_block,
-    _format_subagent_details,
+    _format_content_cached,
     _render_file_references,
     _split_out_code_fences,
+    _stripped_prefix,
     _summary_from_args,
+    _theme_css_vars,
     format_content_to_html,
     messages_to_html,
 )
@@ -140,6 +140,17 @@ class TestRenderFileReferences:
         assert "[file: test.png]" in result
         assert "![test]" not in result
 
+    def test_many_code_spans_restored_in_place(self):
+        text = " ".join(f"`c{i}` [file: /p/{i}.png]" for i in range(12))
+        result = _render_file_references(text)
+        assert "\x00" not in result
+        for i in range(12):
+            assert f"`c{i}` ![{i}.png](/p/{i}.png)" in result
+
+    def test_plain_text_returned_unchanged(self):
+        text = "no references `here`"
+        assert _render_file_references(text) is text
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  _split_out_code_fences
@@ -161,52 +172,6 @@ class TestSplitOutCodeFences:
         assert "b" in parts[1]
 
 
-# ═══════════════════════════════════════════════════════════════════
-#  _format_json_block
-# ═══════════════════════════════════════════════════════════════════
-
-class TestFormatJsonBlock:
-    def test_dict(self):
-        result = _format_json_block({"a": 1, "b": 2})
-        # JSON keys/values are HTML-escaped
-        assert "a" in result
-        assert "1" in result
-        assert "b" in result
-
-    def test_str(self):
-        result = _format_json_block("hello")
-        assert result == "hello"
-
-    def test_int(self):
-        result = _format_json_block(42)
-        assert "42" in result
-
-    def test_escaped_html(self):
-        result = _format_json_block({"x": "<script>"})
-        assert "&lt;script&gt;" in result
-
-
-# ═══════════════════════════════════════════════════════════════════
-#  _fmt_tokens
-# ═══════════════════════════════════════════════════════════════════
-
-class TestFmtTokens:
-    def test_zero(self):
-        assert _fmt_tokens(0) == "0"
-
-    def test_hundreds(self):
-        assert _fmt_tokens(500) == "500"
-
-    def test_thousands(self):
-        assert _fmt_tokens(1500) == "1k"
-
-    def test_ten_thousands(self):
-        assert _fmt_tokens(12300) == "12k"
-
-    def test_millions(self):
-        assert _fmt_tokens(2_500_000) == "2.5M"
-
-
 # ═══════════════════════════════════════════════════════════════════
 #  _summary_from_args
 # ═══════════════════════════════════════════════════════════════════
@@ -244,43 +209,23 @@ class TestSummaryFromArgs:
     def test_empty_args(self):
         assert _summary_from_args("bash", {}) == ""
 
+    def test_generic_preview_truncated(self):
+        body = "  " + "x" * 500 + "\n"
+        assert _summary_from_args("custom", {"content": body}) == "x" * 180
 
-# ═══════════════════════════════════════════════════════════════════
-#  _format_subagent_details
-# ═══════════════════════════════════════════════════════════════════
+    def test_generic_skips_blank_strings(self):
+        assert _summary_from_args("custom", {"a": "   ", "b": " hi \n"}) == "hi"
 
-class TestFormatSubagentDetails:
-    def test_empty(self):
-        assert _format_subagent_details({}) == ""
-
-    def test_no_results(self):
-        assert _format_subagent_details({"results": []}) == ""
-
-    def test_basic(self):
-        details = {
-            "results": [{
-                "agent": "reviewer",
-                "model": "anthropic/claude-sonnet-4",
-                "turns": 2,
-            }]
-        }
-        result = _format_subagent_details(details)
-        assert "reviewer" in result
-        assert "claude-sonnet-4" in result
-        assert "2 turns" in result
-
-    def test_with_usage(self):
-        details = {
-            "results": [{
-                "agent": "coder",
-                "usage": {"input": 5000, "output": 2000, "cacheRead": 1000},
-            }]
-        }
-        result = _format_subagent_details(details)
-        assert "coder" in result
-        assert "5k" in result  # input tokens
-        assert "2k" in result  # output tokens
-        assert "R1k" in result  # cache reads
+
+class TestStrippedPrefix:
+    """_stripped_prefix matches str.strip()[:limit]."""
+
+    @pytest.mark.parametrize("text", [
+        "", "   ", "abc", "  abc  ", "\n\tabc def\n", "ab   ", "a" * 10 + "   " + "b",
+        "a" * 8 + "  ", "  " + "a" * 7 + " " * 5,
+    ])
+    def test_matches_strip_slice(self, text):
+        assert _stripped_prefix(text, 8) == text.strip()[:8]
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -294,11 +239,10 @@ class TestExtractResultText:
     def test_dict_result(self):
         assert '"key": "val"' in _extract_result_text({"result": {"key": "val"}})
 
-    def test_fmt_result_fallback(self):
-        """Should fall back to _fmt_result if result is missing."""
-        # Use a value that won't look like an HTML tag after decoding
-        item = {"_fmt_result": "command output text"}
-        assert "command output text" in _extract_result_text(item)
+    def test_partial_text_fallback(self):
+        """A running tool shows its streamed partial output verbatim."""
+        item = {"_partial_text": "it's 3 > 2 & ok\n"}
+        assert _extract_result_text(item) == "it's 3 > 2 & ok"
 
     def test_empty(self):
         assert _extract_result_text({}) == ""
@@ -333,6 +277,18 @@ class TestMessagesToHtmlUserTurn:
         assert "image" in html
 
 
+class TestMessagesToHtmlFormatCache:
+    def test_cached_matches_uncached(self):
+        text = "**bold** and `code`"
+        assert _format_content_cached(text) == format_content_to_html(text)
+
+    def test_repeat_render_hits_cache(self, sample_turns):
+        messages_to_html(sample_turns)
+        hits = _format_content_cached.cache_info().hits
+        messages_to_html(sample_turns)
+        assert _format_content_cached.cache_info().hits >= hits + len(sample_turns)
+
+
 class TestMessagesToHtmlAssistantTurn:
     def test_assistant_message(self):
         html = messages_to_html([{"kind": "turn", "role": "you", "content": "Response"}])
@@ -423,6 +379,22 @@ class TestBuildHtmlDocument:
         doc_no_scroll = _build_html_document("x", scroll_to_bottom=False)
         assert 'data-scroll="0"' in doc_no_scroll
 
+    def test_placeholders_in_content_untouched(self):
+        doc = _build_html_document("<p>{scroll} /* THEME_VARS */</p>")
+        assert "<p>{scroll} /* THEME_VARS */</p>" in doc
+
+    def test_all_placeholders_filled(self):
+        doc = _build_html_document("x")
+        for slot in ("/* THEME_VARS */", "/* PAGE_NAV_CSS */", "{messages_html}", "{scroll}"):
+            assert slot not in doc
+
+    def test_pre_resolved_theme_vars(self):
+        theme = {"bg": "#000", "border": "not-a-colour"}
+        assert _build_html_document("x", theme_vars=_theme_css_vars(theme)) == (
+            _build_html_document("x", theme=theme)
+        )
+        assert "--border: #cccccc;" in _theme_css_vars(theme)
+
 
 class TestHtmlTemplate:
     """The HTML_TEMPLATE string must contain the expected placeholders."""
@@ -461,11 +433,6 @@ class TestSecurityEscaping:
         assert "<script>" in html
         assert "alert('xss')" in html
 
-    def test_html_in_json_block_is_escaped(self):
-        result = _format_json_block({"x": "<script>evil</script>"})
-        assert "<script>" not in result
-        assert "&lt;" in result
-
     def test_html_in_tool_argument_is_escaped(self):
         """Tool args with HTML content should be escaped in agent-work bubbles."""
         html = messages_to_html([{
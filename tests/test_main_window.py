@@ -163,6 +163,63 @@ class TestVoiceControllerWiring:
         assert btn.text() in ("🎤 Voice", "🎤 STT")
 
 
+class _SlowSttBackend:
+    """Fake STT backend whose calls block until *release* is set."""
+
+    def __init__(self):
+        import threading
+        self.release = threading.Event()
+
+    def is_model_downloaded(self, model):
+        return True
+
+    def preload_model(self, model):
+        self.release.wait(5)
+
+    def transcribe(self, audio_path, model="base", task="transcribe",
+                   language=None):
+        self.release.wait(5)
+        return "text"
+
+
+class TestVoiceShutdown:
+    """shutdown() outlasts workers that are still inside the backend."""
+
+    @pytest.fixture
+    def voice(self, qapp, tmp_path):
+        from PySide6.QtWidgets import QPushButton
+        from ui.voice_controller import VoiceController
+        backend = _SlowSttBackend()
+        ctrl = VoiceController(QPushButton(), backend, None, tmp_path)
+        yield ctrl, backend
+        backend.release.set()
+        ctrl.shutdown()
+
+    @staticmethod
+    def _shutdown_while_running(ctrl, backend, thread):
+        import threading
+        waits = []
+        real_wait = thread.wait
+        thread.wait = lambda *a: waits.append(a) or real_wait(*a)
+        threading.Timer(0.2, backend.release.set).start()
+        assert thread.isRunning()
+        ctrl.shutdown()
+        assert waits == [()]  # no timeout
+        assert not thread.isRunning()
+
+    def test_waits_for_running_transcription(self, voice, tmp_path):
+        ctrl, backend = voice
+        wav = tmp_path / "rec.wav"
+        wav.write_bytes(b"")
+        ctrl._do_transcribe(str(wav), "base")
+        self._shutdown_while_running(ctrl, backend, ctrl._transcribe_thread)
+
+    def test_waits_for_running_preload(self, voice):
+        ctrl, backend = voice
+        ctrl._preload_model()
+        self._shutdown_while_running(ctrl, backend, ctrl._preload_thread)
+
+
 # ═══════════════════════════════════════════════════════════════════
 #  Settings dialog wiring
 # ═══════════════════════════════════════════════════════════════════
@@ -207,3 +264,267 @@ class TestKeyboardShortcuts:
 
     def test_model_picker_shortcut(self, main_window):
         assert hasattr(main_window, "_on_open_model_picker")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Model capability queries
+# ═══════════════════════════════════════════════════════════════════
+
+class TestCapabilityQuery:
+    """Backend modality results arrive asynchronously."""
+
+    URL = "http://localhost:8080/v1/models"
+
+    def test_merges_for_current_model(self, main_window):
+        main_window._current_model_id = "m1"
+        main_window._modalities = ["text"]
+        main_window._on_capabilities_fetched(self.URL, "m1", ["text", "image"])
+        assert main_window._modalities == ["text", "image"]
+
+    def test_ignores_stale_model(self, main_window):
+        main_window._current_model_id = "m2"
+        main_window._modalities = ["text"]
+        main_window._on_capabilities_fetched(self.URL, "m1", ["image"])
+        assert main_window._modalities == ["text"]
+
+    def test_cached_result_applied_without_query(self, main_window, monkeypatch):
+        import ui.main_window as mw
+        main_window._on_capabilities_fetched(self.URL, "m1", ["image"])
+        monkeypatch.setattr(
+            mw, "_fetch_input_modalities",
+            lambda *a: pytest.fail("backend queried again"),
+        )
+        main_window._current_model_id = "m1"
+        main_window._modalities = ["text"]
+        main_window._query_backend_capabilities("http://localhost:8080/v1", "m1")
+        assert main_window._modalities == ["text", "image"]
+
+    def test_empty_result_not_cached(self, main_window):
+        main_window._on_capabilities_fetched(self.URL, "m3", [])
+        assert (self.URL, "m3") not in main_window._capabilities_cache
+
+    def test_remote_backend_skipped(self, main_window, monkeypatch):
+        # Non-local URLs never start a query thread.
+        import ui.main_window as mw
+        started, emitted = [], []
+        monkeypatch.setattr(
+            mw.threading, "Thread", lambda *a, **kw: started.append(kw)
+        )
+        monkeypatch.setattr(
+            mw, "_fetch_input_modalities",
+            lambda *a: pytest.fail("remote backend queried"),
+        )
+        main_window._capabilities_fetched.connect(
+            lambda *args: emitted.append(args)
+        )
+        main_window._query_backend_capabilities("https://example.com/v1", "m1")
+        assert started == []
+        assert emitted == []
+        assert not main_window._capabilities_inflight
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  Path label git branch lookup
+# ═══════════════════════════════════════════════════════════════════
+
+class TestGitBranch:
+    """_git_branch re-runs git only when HEAD changes."""
+
+    @staticmethod
+    def _git(cwd, *args):
+        import subprocess
+        subprocess.run(
+            ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+            cwd=cwd, check=True, capture_output=True,
+        )
+
+    def _init(self, cwd, branch):
+        self._git(cwd, "init", "-q", "-b", branch)
+        self._git(cwd, "commit", "-q", "--allow-empty", "-m", "init")
+
+    def test_not_a_repo(self, tmp_path):
+        from ui.main_window import _git_branch
+        assert _git_branch(tmp_path) == ""
+
+    def test_branch_switch_detected(self, tmp_path):
+        import os
+        from ui.main_window import _git_branch
+        self._init(tmp_path, "main")
+        assert _git_branch(tmp_path) == "main"
+        assert _git_branch(tmp_path) == "main"  # served from cache
+
+        self._git(tmp_path, "checkout", "-q", "-b", "feature/x")
+        head = tmp_path / ".git" / "HEAD"
+        st = head.stat()
+        os.utime(head, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert _git_branch(tmp_path) == "feature/x"
+
+    def test_subdirectory(self, tmp_path):
+        from ui.main_window import _git_branch
+        self._init(tmp_path, "trunk")
+        sub = tmp_path / "a" / "b"
+        sub.mkdir(parents=True)
+        assert _git_branch(sub) == "trunk"
+
+
+class TestReadSessionDefaults:
+    """_read_session_defaults returns cwd, model and thinking level in one pass."""
+
+    def test_reads_last_entries(self, tmp_path):
+        import json
+        from ui.main_window import MainWindow
+        path = tmp_path / "s.jsonl"
+        entries = [
+            {"type": "session", "cwd": "/work"},
+            {"type": "model_change", "provider": "a", "modelId": "m1"},
+            {"type": "message", "message": {"content": "x" * 1000}},
+            {"type": "thinking_level_change", "thinkingLevel": "high"},
+            {"type": "model_change", "provider": "b", "modelId": "m2"},
+        ]
+        path.write_text("\n".join(json.dumps(e) for e in entries) + "\n")
+        assert MainWindow._read_session_defaults(str(path)) == (
+            "/work", "b", "m2", "high",
+        )
+
+    def test_missing_file(self, tmp_path):
+        from ui.main_window import MainWindow
+        assert MainWindow._read_session_defaults(str(tmp_path / "nope")) == (
+            None, "", "", "",
+        )
+
+    def test_cwd_reader_matches_header(self, tmp_path):
+        from ui.main_window import MainWindow
+        path = tmp_path / "s.jsonl"
+        path.write_text('{"type":"session","cwd":"/work"}\n{"type":"message"}\n')
+        assert MainWindow._read_session_cwd(str(path)) == "/work"
+        path.write_text("[1, 2]\n")
+        assert MainWindow._read_session_cwd(str(path)) is None
+        assert MainWindow._read_session_defaults(str(path))[0] is None
+
+
+class TestChatStreamingModel:
+    """Streaming deltas update the live turn and thinking block in place."""
+
+    def test_deltas_reach_live_messages(self, main_window):
+        chat = main_window.chat
+        chat.clear()
+        chat.add_thinking()
+        chat.append_thinking_delta("Let me ")
+        chat.append_thinking_delta("think")
+        chat.end_thinking()
+        chat.begin_assistant_stream()
+        chat.append_assistant_delta("Hello")
+        chat.append_assistant_delta(" world")
+        assert chat.last_assistant_text() == "Hello world"
+        chat.append_assistant_delta("!")
+        chat.end_assistant_stream()
+        chat.append_assistant_delta(" ignored")
+        thinking, turn = chat._messages
+        assert thinking == {"kind": "thinking", "text": "Let me think", "expanded": False}
+        assert turn == {"kind": "turn", "role": "you", "content": "Hello world!"}
+
+    def test_tool_events_share_stack_by_id(self, main_window):
+        chat = main_window.chat
+        chat.clear()
+        chat.upsert_tool_event("s1", {"event_type": "tool_call", "tool_call_id": "t1"})
+        chat.add_turn("you", "between")
+        chat.upsert_tool_event("s1", {"event_type": "tool_call", "tool_call_id": "t2"})
+        stacks = [m for m in chat._messages if m["kind"] == "tool_stack"]
+        assert len(stacks) == 1
+        assert [i["tool_call_id"] for i in stacks[0]["items"]] == ["t1", "t2"]
+        chat.clear()
+        assert chat._find_tool_stack("s1") is None
+
+    def test_render_mid_stream_keeps_stream_target(self, main_window):
+        chat = main_window.chat
+        chat.clear()
+        chat.add_turn("human", "q")
+        chat.begin_assistant_stream()
+        chat.append_assistant_delta("partial")
+        chat.add_activity("extension note")   # full re-render mid-stream
+        page = chat._page_html[chat._page_message_range(0)]
+        assert 'id="assistant-stream-content"' in page
+        assert "partial" in page
+        assert chat._pending_assistant_deltas == []
+        chat.end_assistant_stream()
+        chat._render()
+        page = chat._page_html[chat._page_message_range(0)]
+        assert "assistant-stream-content" not in page
+
+    def test_page_cache_sees_edits_on_earlier_pages(self, main_window):
+        chat = main_window.chat
+        chat.clear()
+        chat._page_size = 1
+        chat._pages_displayed = 2
+        chat.add_turn("human", "q1")
+        chat.begin_assistant_stream()
+        chat.append_assistant_delta("first")
+        chat.upsert_tool_event("s1", {"event_type": "tool_call", "tool_call_id": "t1"})
+        chat._render()
+        # Steering starts page 2 while the page 1 reply is still live.
+        chat.add_steer_message("steer")
+        chat._render()
+        chat.upsert_tool_event("s1", {
+            "event_type": "tool_result", "tool_call_id": "t1",
+            "ok": True, "result": "tool-output",
+        })
+        chat._render()
+        assert "tool-output" in chat._page_html[chat._page_message_range(0)]
+        chat.append_assistant_delta("-part")
+        chat.end_assistant_stream()
+        chat._render()
+        assert "first-part" in chat._page_html[chat._page_message_range(0)]
+
+
+class TestExtensionStatus:
+    """setStatus requests only touch the label when the text changes."""
+
+    def test_repeat_status_skips_update(self, main_window, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            main_window, "_update_status_extras", lambda: calls.append(1)
+        )
+        main_window._on_extension_ui_status("k", "working")
+        main_window._on_extension_ui_status("k", "working")
+        main_window._on_extension_ui_status("k", "")
+        main_window._on_extension_ui_status("k", "")
+        assert len(calls) == 2
+        assert "k" not in main_window._status_entries
+
+    def test_user_turn_indices_track_appends(self, main_window):
+        chat = main_window.chat
+        chat.clear()
+        chat.add_turn("human", "q1")
+        chat.add_thinking("t")
+        chat.add_turn("you", "a1")
+        chat.add_steer_message("steer")
+        chat.add_activity("act")
+        chat.add_turn("human", "q2")
+        expected = [
+            i for i, m in enumerate(chat._messages)
+            if m["kind"] == "turn" and m["role"] == "human"
+        ]
+        assert chat._user_message_indices() == expected == [0, 3, 5]
+        chat.clear()
+        assert chat._user_message_indices() == []
+
+
+class TestStatusBarRefresh:
+    """Command and model lists are re-requested at most once per TTL."""
+
+    def test_catalog_queries_throttled(self, main_window, monkeypatch):
+        sent: list[list[str]] = []
+        monkeypatch.setattr(
+            main_window._bridge, "send_commands",
+            lambda cmds: sent.append([c["type"] for c in cmds]),
+        )
+        main_window._catalog_requested_at = None
+        main_window._refresh_status_bar()
+        main_window._refresh_status_bar()
+        assert sent == [
+            ["get_state", "get_session_stats", "get_commands", "get_available_models"],
+            ["get_state", "get_session_stats"],
+        ]
+        main_window._catalog_requested_at -= main_window._CATALOG_TTL_S
+        main_window._refresh_status_bar()
+        assert "get_commands" in sent[-1]
@@ -7,11 +7,18 @@ helpers that parse pi's message format.
 
 from __future__ import annotations
 
+import json
 from typing import Any
 
 import pytest
 
-from controller.pi_bridge import _extract_text_from_content, _str_content
+from controller.pi_bridge import (
+    _dumps_line,
+    _extract_text_from_content,
+    _loads,
+    _log_preview,
+    _str_content,
+)
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -86,3 +93,72 @@ class TestExtractTextFromContent:
 
     def test_non_list_content(self):
         assert _extract_text_from_content({"content": "not a list"}) == ""
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  _loads
+# ═══════════════════════════════════════════════════════════════════
+
+class TestLoads:
+    """Parse JSONL lines from pi's stdout."""
+
+    def test_event_object(self):
+        assert _loads('{"type":"agent_start"}') == {"type": "agent_start"}
+
+    def test_non_ascii(self):
+        assert _loads('{"delta":"café \\u2014 ok"}') == {"delta": "café — ok"}
+
+    def test_lone_surrogate_escape(self):
+        # JSON.stringify escapes unpaired surrogates; orjson rejects them.
+        assert _loads('{"delta":"\\ud83d"}') == {"delta": "\ud83d"}
+
+    def test_invalid_raises_json_error(self):
+        with pytest.raises(json.JSONDecodeError):
+            _loads("{not json")
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  _dumps_line
+# ═══════════════════════════════════════════════════════════════════
+
+class TestDumpsLine:
+    """Serialise RPC commands as JSONL lines."""
+
+    def test_compact_single_line(self):
+        assert _dumps_line({"type": "get_state"}) == '{"type":"get_state"}\n'
+
+    def test_non_ascii_kept(self):
+        line = _dumps_line({"type": "prompt", "message": "café\nok"})
+        assert line.count("\n") == 1
+        assert json.loads(line) == {"type": "prompt", "message": "café\nok"}
+        assert "café" in line
+
+    def test_batch_is_concatenated_lines(self):
+        cmds = [{"type": "get_state"}, {"type": "get_commands"}]
+        batch = "".join(_dumps_line(c) for c in cmds)
+        assert [json.loads(l) for l in batch.splitlines()] == cmds
+
+    def test_lone_surrogate_falls_back(self):
+        # orjson refuses unpaired surrogates; the fallback escapes them
+        # so the line can still be written to pi's UTF-8 stdin.
+        pytest.importorskip("orjson")
+        line = _dumps_line({"type": "prompt", "message": "a\ud83d"})
+        assert line.endswith("\n")
+        line.encode("utf-8")
+        assert json.loads(line) == {"type": "prompt", "message": "a\ud83d"}
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  _log_preview
+# ═══════════════════════════════════════════════════════════════════
+
+class TestLogPreview:
+    """Rejected stdout lines are echoed to stderr in bounded form."""
+
+    def test_short_line_is_plain_repr(self):
+        assert _log_preview("oops\n") == repr("oops\n")
+
+    def test_long_line_is_truncated(self):
+        out = _log_preview("x" * 10_000)
+        assert len(out) < 300
+        assert out.endswith("... (10000 chars)")
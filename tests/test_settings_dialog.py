@@ -126,6 +126,21 @@ class TestToolExtensionsDefaults:
         """TTS model list should have 21 entries."""
         assert dialog._tts_direct_model.count() == 21
 
+    def test_scan_result_marks_cached_models(self, dialog):
+        """A finished background scan relabels the combo, cached first."""
+        dialog._tts_scan_running = True
+        dialog._on_tts_models_scanned({
+            "tts_models/en/jenny/jenny": False,
+            "tts_models/en/ljspeech/vits": True,
+        })
+        assert not dialog._tts_scan_running
+        items = [dialog._tts_direct_model.itemText(i)
+                 for i in range(dialog._tts_direct_model.count())]
+        assert items == [
+            "tts_models/en/ljspeech/vits  ✓",
+            "tts_models/en/jenny/jenny",
+        ]
+
 
 # ═══════════════════════════════════════════════════════════════════
 #  Tool Extensions tab — config persistence
@@ -197,3 +212,33 @@ class TestSttTabWithoutBackend:
         # Tab exists — _build_stt_tab took the early-return path
         # and added its stretch + tab normally
         assert dialog._tabs.tabText(2) == "Speech-to-Text"
+
+
+# ═══════════════════════════════════════════════════════════════════
+#  read_pi_settings — mtime-keyed parse cache
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TestReadPiSettings:
+    """settings.json is parsed once per on-disk version."""
+
+    def test_missing_file(self, tmp_path):
+        from ui.settings_dialog import read_pi_settings
+        assert read_pi_settings(tmp_path / "settings.json") == {}
+
+    def test_unchanged_file_is_cached(self, tmp_path):
+        from ui.settings_dialog import read_pi_settings
+        path = tmp_path / "settings.json"
+        path.write_text(json.dumps({"theme": "dark"}))
+        assert read_pi_settings(path) is read_pi_settings(path)
+
+    def test_rewrite_is_picked_up(self, tmp_path):
+        import os
+        from ui.settings_dialog import read_pi_settings
+        path = tmp_path / "settings.json"
+        path.write_text(json.dumps({"theme": "dark"}))
+        assert read_pi_settings(path)["theme"] == "dark"
+        path.write_text(json.dumps({"theme": "light!"}))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert read_pi_settings(path)["theme"] == "light!"